@@ -0,0 +1,134 @@
+"""
+Playwright backend for the TopTiket Winner scraper
+Same flow as winner_scraper.login_and_extract_winner, but commands go over a
+persistent CDP connection and images/css/fonts are aborted at the network layer
+"""
+
+from bs4 import BeautifulSoup
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from winner_scraper import (
+    _USERNAME_SELECTORS, _PASSWORD_SELECTORS, _TAB_SELECTORS,
+    extract_winner_odds, extract_match_info, write_debug_dump
+)
+
+# Resource types that carry no odds text
+_BLOCKED_RESOURCES = {'image', 'stylesheet', 'font', 'media'}
+
+def _block_assets(route):
+    if route.request.resource_type in _BLOCKED_RESOURCES:
+        route.abort()
+    else:
+        route.continue_()
+
+def login_and_extract_winner_playwright(match_url, username, password, headless=False, verbose=True, debug_dump=False):
+    """
+    Login to TopTiket and extract Winner odds from a specific match page using Playwright
+    """
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless, args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu'])
+        try:
+            page = browser.new_page(viewport={'width': 1920, 'height': 1080})
+            page.route('**/*', _block_assets)
+
+            # Step 1: Login
+            if verbose:
+                print(f"🔐 Logging in to TopTiket with user: {username}")
+
+            page.goto('https://toptiket.rs/login', wait_until='domcontentloaded')
+
+            username_field = page.locator(', '.join(_USERNAME_SELECTORS)).first
+            password_field = page.locator(', '.join(_PASSWORD_SELECTORS)).first
+            try:
+                username_field.wait_for(timeout=10000)
+            except PlaywrightTimeoutError:
+                print("❌ Could not find username field")
+                return None
+            if not password_field.count():
+                print("❌ Could not find password field")
+                return None
+
+            username_field.fill(username)
+            password_field.fill(password)
+            if verbose:
+                print("✅ Login fields filled")
+
+            submit = page.locator("button[type='submit'], input[type='submit']").first
+            if submit.count():
+                submit.click()
+            else:
+                password_field.press('Enter')
+            if verbose:
+                print("✅ Login form submitted")
+            
+            # The login page is already loaded, so wait for the redirect away from it
+            # (navigating to the match earlier would abort the in-flight login)
+            try:
+                page.wait_for_url(lambda url: '/login' not in url, timeout=10000)
+            except PlaywrightTimeoutError:
+                if verbose:
+                    print("⚠️ Still on the login page after submitting, continuing anyway")
+
+            # Step 2: Navigate to the specific match
+            if verbose:
+                print(f"🏈 Navigating to match: {match_url}")
+
+            page.goto(match_url, wait_until='domcontentloaded')
+
+            # Step 3: Click on Prolaz/Winner tab
+            if verbose:
+                print("🎯 Looking for Prolaz/Winner tab")
+
+            tab_clicked = False
+            for selector in _TAB_SELECTORS:
+                tab = page.locator(f'xpath={selector}').first
+                if not tab.count():
+                    continue
+                try:
+                    tab.click(timeout=3000)
+                    tab_clicked = True
+                    if verbose:
+                        print(f"✅ Clicked tab with selector: {selector}")
+                    break
+                except PlaywrightTimeoutError:
+                    continue
+
+            if not tab_clicked and verbose:
+                print("⚠️ Could not find Prolaz/Winner tab, continuing with current page")
+
+            # Wait for odds to render instead of a fixed sleep
+            try:
+                page.wait_for_selector('[class*="odd"]', timeout=10000)
+            except PlaywrightTimeoutError:
+                if verbose:
+                    print("⚠️ Odds elements did not appear, parsing current page")
+
+            # Step 4: Extract the page content
+            page_source = page.content()
+
+            # Step 5: Parse Winner odds with the shared extractors
+            soup = BeautifulSoup(page_source, 'lxml')
+            winner_odds = extract_winner_odds(soup, verbose=verbose)
+            match_info = extract_match_info(soup, verbose=verbose)
+
+            result = {
+                'match_url': match_url,
+                'match_info': match_info,
+                'winner_odds': winner_odds,
+                'page_title': page.title()
+            }
+
+            if debug_dump:
+                write_debug_dump(match_url, page_source, result, verbose=verbose)
+
+            if verbose:
+                print(f"🏆 Match: {match_info.get('teams', 'Unknown')}")
+                print(f"📊 Winner odds: {winner_odds}")
+
+            return result
+
+        except Exception as e:
+            print(f"❌ Error during scraping: {e}")
+            return None
+
+        finally:
+            browser.close()
@@ -0,0 +1,103 @@
+"""
+Chrome/Selenium helpers shared by the TopTiket Winner scrapers
+(winner_scraper, winner_scraper_enhanced, winner_scraper_fixed)
+"""
+
+import os
+import time
+from pathlib import Path
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException
+from webdriver_manager.chrome import ChromeDriverManager
+
+# Resolved chromedriver path, reused across runs for a day to skip webdriver_manager's version check
+DRIVER_PATH_CACHE = Path.home() / '.cache' / 'surebet' / 'chromedriver_path'
+DRIVER_PATH_TTL = 24 * 3600
+
+# Resolved once per process and reused by every scrape (see driver_path)
+_DRIVER_PATH = None
+
+def driver_path(refresh=False):
+    """
+    Return the chromedriver path, calling ChromeDriverManager().install() at most once a day
+    refresh: drop the cached path and install again (the cached driver no longer matches Chrome)
+    """
+    global _DRIVER_PATH
+    if refresh:
+        _DRIVER_PATH = None
+        try:
+            DRIVER_PATH_CACHE.unlink()
+        except OSError:
+            pass
+    if _DRIVER_PATH is not None:
+        return _DRIVER_PATH
+    
+    try:
+        if time.time() - DRIVER_PATH_CACHE.stat().st_mtime < DRIVER_PATH_TTL:
+            cached = DRIVER_PATH_CACHE.read_text(encoding='utf-8').strip()
+            if os.path.exists(cached):
+                _DRIVER_PATH = cached
+                return cached
+    except OSError:
+        pass
+    
+    _DRIVER_PATH = ChromeDriverManager().install()
+    try:
+        DRIVER_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        DRIVER_PATH_CACHE.write_text(_DRIVER_PATH, encoding='utf-8')
+    except OSError:
+        pass
+    return _DRIVER_PATH
+
+def start_chrome(options):
+    """
+    Start Chrome on the cached chromedriver
+    After a Chrome auto-update the cached driver is the wrong version (SessionNotCreatedException):
+    the cache is dropped and the matching driver installed once before retrying
+    """
+    try:
+        return webdriver.Chrome(service=Service(driver_path()), options=options)
+    except SessionNotCreatedException:
+        return webdriver.Chrome(service=Service(driver_path(refresh=True)), options=options)
+
+# Resolves a list of CSS/XPath selectors inside the browser in one round-trip and
+# returns the first hit of each selector, in selector order, without duplicates
+LOCATE_ALL_JS = """
+const found = [];
+for (const sel of arguments[0]) {
+    let el = null;
+    try {
+        el = sel.startsWith('/')
+            ? document.evaluate(sel, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+            : document.querySelector(sel);
+    } catch (e) {
+        continue;
+    }
+    if (el && !found.includes(el)) found.push(el);
+}
+return found;
+"""
+
+def locate_all(driver, selectors):
+    """Candidate elements for a selector list, found with a single execute_script call"""
+    try:
+        return driver.execute_script(LOCATE_ALL_JS, selectors) or []
+    except Exception:
+        return []
+
+def wait_until(driver, condition, timeout=10):
+    """Explicit wait that returns False on timeout instead of aborting the scrape"""
+    try:
+        return WebDriverWait(driver, timeout).until(condition)
+    except TimeoutException:
+        return False
+
+def wait_for_odds_refresh(driver, previous_odds, odds_css):
+    """After a tab click, wait for the old odds nodes to be replaced and the new ones (odds_css) to render"""
+    if previous_odds:
+        wait_until(driver, EC.staleness_of(previous_odds[0]), timeout=3)
+    wait_until(driver, EC.presence_of_element_located((By.CSS_SELECTOR, odds_css)))
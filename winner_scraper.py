@@ -3,22 +3,101 @@ Direct Winner Market Scraper for TopTiket
 Navigates directly to specific match pages and extracts Winner 1/Winner 2 odds
 """
 
+import io
 import time
 import json
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
+import zipfile
+from collections import deque
+from pathlib import Path
+import requests
+from requests.adapters import HTTPAdapter
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
+import soupsieve
+from toptiket_driver import start_chrome, locate_all
 
-def login_and_extract_winner(match_url, username, password, headless=False, verbose=True):
+# Odds-looking numbers such as 1.85 or 12.50
+_ODDS_RE = re.compile(r'\b(\d+\.\d{2})\b')
+
+# Shared keep-alive session for HTTP fallbacks, pool sized for parallel workers
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+# Winner market labels and the containers that can hold a market
+_WINNER_SECTION_RE = re.compile(r'winner|prolaz', re.IGNORECASE)
+_SECTION_TAGS = ('div', 'section', 'table', 'tbody')
+
+# XHR/fetch responses that carry the match odds feed
+_ODDS_FEED_URL_RE = re.compile(r'/odds|/match|/prolaz', re.IGNORECASE)
+
+# Match kick-off time/date patterns, in priority order, and the nodes that usually hold them
+_TIME_RES = [re.compile(p) for p in (r'\d{1,2}:\d{2}', r'\d{1,2}\.\s*\d{1,2}\.', r'\d{1,2}/\d{1,2}')]
+_MATCH_TIME_SELECTOR = soupsieve.compile('time, [class*="date"], [class*="time"]')
+
+# Login form and Prolaz/Winner tab locators (shared with playwright_scraper)
+_USERNAME_SELECTORS = [
+    "input[name='username']",
+    "input[name*='user']", 
+    "input[type='text']",
+    "input[placeholder*='user']",
+    "input[placeholder*='korisn']"
+]
+
+_PASSWORD_SELECTORS = [
+    "input[name='password']",
+    "input[type='password']",
+    "input[placeholder*='pass']",
+    "input[placeholder*='lozin']"
+]
+
+_LOGIN_BUTTON_SELECTORS = [
+    "button[type='submit']",
+    "input[type='submit']",
+    "//button[contains(text(), 'Prijavi')]",
+    "//button[contains(text(), 'Login')]"
+]
+
+_TAB_SELECTORS = [
+    "//a[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
+    "//button[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
+    "//div[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
+    "//span[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
+    "//a[contains(translate(text(), 'WINNER', 'winner'), 'winner')]",
+    "//button[contains(translate(text(), 'WINNER', 'winner'), 'winner')]",
+    "//div[contains(text(), 'Winner')]",
+    "//span[contains(text(), 'Winner')]",
+    "//a[text()='Prolaz']",
+    "//button[text()='Prolaz']"
+]
+
+# Team-name candidates, compiled once into a single selector
+_MATCH_INFO_SELECTOR = soupsieve.compile(', '.join([
+    'h1', 'h2', '.match-title', '.teams', '.fixture-title',
+    '[class*="team"]', '[class*="match"]', '[class*="fixture"]'
+]))
+
+def login_and_extract_winner(match_url, username, password, headless=False, verbose=True, debug_dump=False,
+                             use_playwright=False, use_odds_feed=False):
     """
     Login to TopTiket and extract Winner odds from a specific match page
+    
+    debug_dump: save page HTML and parsed results to disk (off by default so
+    batch/parallel runs don't pay for megabyte-sized writes per match)
+    use_playwright: drive the browser with Playwright instead of Selenium
+    (see playwright_scraper.py)
+    use_odds_feed: read odds from the JSON responses the page fetched and only
+    fall back to HTML parsing when no Winner market is found there (opt-in: the
+    feed walker matches labels and has not been checked against the real feed yet)
     """
+    if use_playwright:
+        from playwright_scraper import login_and_extract_winner_playwright
+        return login_and_extract_winner_playwright(match_url, username, password, headless=headless,
+                                                   verbose=verbose, debug_dump=debug_dump)
+    
     options = Options()
     if headless:
         options.add_argument('--headless=new')
@@ -26,8 +105,23 @@ def login_and_extract_winner(match_url, username, password, headless=False, verb
     options.add_argument('--disable-dev-shm-usage')
     options.add_argument('--disable-gpu')
     options.add_argument('--window-size=1920,1080')
+    # Performance: only text is scraped, so skip images/css/fonts and background traffic
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-background-networking')
+    options.add_argument('--disable-sync')
+    options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': 2,
+        'profile.managed_default_content_settings.stylesheets': 2,
+        'profile.managed_default_content_settings.fonts': 2
+    })
+    # Return from driver.get() once the DOM is interactive instead of after every sub-resource
+    options.page_load_strategy = 'eager'
+    if use_odds_feed:
+        # Network events are needed to find the odds XHR responses
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
     
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    driver = start_chrome(options)
     
     try:
         # Step 1: Login
@@ -39,21 +133,7 @@ def login_and_extract_winner(match_url, username, password, headless=False, verb
         time.sleep(2)
         
         # Find and fill username field
-        username_selectors = [
-            "input[name='username']",
-            "input[name*='user']", 
-            "input[type='text']",
-            "input[placeholder*='user']",
-            "input[placeholder*='korisn']"
-        ]
-        
-        username_field = None
-        for selector in username_selectors:
-            try:
-                username_field = driver.find_element(By.CSS_SELECTOR, selector)
-                break
-            except:
-                continue
+        username_field = next(iter(locate_all(driver, _USERNAME_SELECTORS)), None)
         
         if username_field:
             username_field.clear()
@@ -65,20 +145,7 @@ def login_and_extract_winner(match_url, username, password, headless=False, verb
             return None
         
         # Find and fill password field
-        password_selectors = [
-            "input[name='password']",
-            "input[type='password']",
-            "input[placeholder*='pass']",
-            "input[placeholder*='lozin']"
-        ]
-        
-        password_field = None
-        for selector in password_selectors:
-            try:
-                password_field = driver.find_element(By.CSS_SELECTOR, selector)
-                break
-            except:
-                continue
+        password_field = next(iter(locate_all(driver, _PASSWORD_SELECTORS)), None)
         
         if password_field:
             password_field.clear()
@@ -90,22 +157,9 @@ def login_and_extract_winner(match_url, username, password, headless=False, verb
             return None
         
         # Submit login
-        login_button_selectors = [
-            "button[type='submit']",
-            "input[type='submit']",
-            "button:contains('Prijavi')",
-            "button:contains('Login')",
-            "//button[contains(text(), 'Prijavi')]",
-            "//button[contains(text(), 'Login')]"
-        ]
-        
         login_submitted = False
-        for selector in login_button_selectors:
+        for button in locate_all(driver, _LOGIN_BUTTON_SELECTORS):
             try:
-                if selector.startswith('//'):
-                    button = driver.find_element(By.XPATH, selector)
-                else:
-                    button = driver.find_element(By.CSS_SELECTOR, selector)
                 button.click()
                 login_submitted = True
                 break
@@ -140,29 +194,16 @@ def login_and_extract_winner(match_url, username, password, headless=False, verb
         if verbose:
             print("🎯 Looking for Prolaz/Winner tab")
         
-        tab_selectors = [
-            "//a[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
-            "//button[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
-            "//div[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
-            "//span[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
-            "//a[contains(translate(text(), 'WINNER', 'winner'), 'winner')]",
-            "//button[contains(translate(text(), 'WINNER', 'winner'), 'winner')]",
-            "//div[contains(text(), 'Winner')]",
-            "//span[contains(text(), 'Winner')]",
-            "//a[text()='Prolaz']",
-            "//button[text()='Prolaz']"
-        ]
-        
         tab_clicked = False
-        for selector in tab_selectors:
+        for tab in locate_all(driver, _TAB_SELECTORS):
             try:
-                tab = driver.find_element(By.XPATH, selector)
                 driver.execute_script("arguments[0].scrollIntoView({block:'center'});", tab)
                 time.sleep(0.5)
+                tab_text = tab.text.strip()[:20]
                 tab.click()
                 tab_clicked = True
                 if verbose:
-                    print(f"✅ Clicked tab with selector: {selector}")
+                    print(f"✅ Clicked tab: '{tab_text}'")
                 time.sleep(2)
                 break
             except Exception as e:
@@ -175,18 +216,15 @@ def login_and_extract_winner(match_url, username, password, headless=False, verb
         # Step 4: Extract the page content
         page_source = driver.page_source
         
-        # Save HTML for inspection
-        with open('winner_match_page.html', 'w', encoding='utf-8') as f:
-            f.write(page_source)
-        
-        if verbose:
-            print("💾 Saved page HTML to winner_match_page.html")
-        
         # Step 5: Parse Winner odds
-        soup = BeautifulSoup(page_source, 'html.parser')
+        soup = BeautifulSoup(page_source, 'lxml')
         
-        # Look for Winner 1 and Winner 2 odds
-        winner_odds = extract_winner_odds(soup, verbose=verbose)
+        # Prefer the JSON odds feed, fall back to scraping the rendered HTML
+        winner_odds = {}
+        if use_odds_feed:
+            winner_odds = extract_winner_odds_from_feed(capture_odds_feed(driver, verbose=verbose), verbose=verbose)
+        if not winner_odds:
+            winner_odds = extract_winner_odds(soup, verbose=verbose)
         
         # Extract match info
         match_info = extract_match_info(soup, verbose=verbose)
@@ -198,12 +236,11 @@ def login_and_extract_winner(match_url, username, password, headless=False, verb
             'page_title': driver.title
         }
         
-        # Save results to JSON
-        with open('winner_results.json', 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        # Save page HTML and results for inspection
+        if debug_dump:
+            write_debug_dump(match_url, page_source, result, verbose=verbose)
         
         if verbose:
-            print("💾 Saved results to winner_results.json")
             print(f"🏆 Match: {match_info.get('teams', 'Unknown')}")
             print(f"📊 Winner odds: {winner_odds}")
         
@@ -216,56 +253,164 @@ def login_and_extract_winner(match_url, username, password, headless=False, verb
     finally:
         driver.quit()
 
-def extract_match_info(soup, verbose=False):
-    """Extract match information from the page"""
-    match_info = {}
+def write_debug_dump(match_url, page_source, result, verbose=False):
+    """
+    Save page HTML and parsed results as one zip per match (a single write)
+    Named by match id so parallel workers don't clobber each other
+    """
+    match_id = match_url.rstrip('/').rsplit('/', 1)[-1]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('winner_match_page.html', page_source)
+        archive.writestr('winner_results.json', json.dumps(result, ensure_ascii=False, indent=2))
     
-    # Try to find team names
-    possible_selectors = [
-        'h1', 'h2', '.match-title', '.teams', '.fixture-title',
-        '[class*="team"]', '[class*="match"]', '[class*="fixture"]'
-    ]
+    dump_path = Path(f'winner_debug_{match_id}.zip')
+    dump_path.write_bytes(buffer.getvalue())
+    if verbose:
+        print(f"💾 Saved page HTML and results to {dump_path}")
+    return dump_path
+
+def capture_odds_feed(driver, verbose=False):
+    """
+    Collect JSON odds payloads the page fetched, using Chrome performance logs
+    Requires the driver to be started with goog:loggingPrefs performance logging
+    """
+    payloads = []
+    cookies = None
+    try:
+        entries = driver.get_log('performance')
+    except Exception as e:
+        if verbose:
+            print(f"⚠️ Performance log not available: {e}")
+        return payloads
     
-    for selector in possible_selectors:
+    for entry in entries:
         try:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text(strip=True)
-                if ' vs ' in text.lower() or ' - ' in text:
-                    match_info['teams'] = text
-                    break
-            if 'teams' in match_info:
-                break
-        except:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError):
+            continue
+        if message.get('method') != 'Network.responseReceived':
+            continue
+        
+        params = message.get('params', {})
+        response = params.get('response', {})
+        if 'json' not in response.get('mimeType', '') or not _ODDS_FEED_URL_RE.search(response.get('url', '')):
+            continue
+        
+        try:
+            body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})['body']
+        except Exception:
+            # Body already evicted from the browser cache - fetch it again with the browser's cookies
+            if cookies is None:
+                cookies = {c['name']: c['value'] for c in driver.get_cookies()}
+            try:
+                body = _SESSION.get(response['url'], cookies=cookies, timeout=10).text
+            except requests.RequestException:
+                continue
+        
+        try:
+            payloads.append((response['url'], json.loads(body)))
+        except ValueError:
             continue
     
+    if verbose:
+        print(f"📡 Captured {len(payloads)} JSON odds responses")
+    
+    return payloads
+
+def _feed_odds_values(node, limit=2):
+    """Collect the first odds-looking values (in document order) under a JSON node"""
+    values = []
+    queue = deque([node])
+    while queue and len(values) < limit:
+        item = queue.popleft()
+        if isinstance(item, dict):
+            queue.extend(item.values())
+        elif isinstance(item, list):
+            queue.extend(item)
+        elif isinstance(item, float) and 1.1 <= item <= 10.0:
+            values.append(item)
+        elif isinstance(item, str) and _ODDS_RE.fullmatch(item) and 1.1 <= float(item) <= 10.0:
+            values.append(float(item))
+    return values
+
+def extract_winner_odds_from_feed(payloads, verbose=False):
+    """Find a Winner/Prolaz market in captured JSON payloads and return its two odds"""
+    winner_odds = {}
+    
+    queue = deque(data for _, data in payloads)
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, dict):
+            labels = ' '.join(v for v in node.values() if isinstance(v, str)).lower()
+            if 'winner' in labels or 'prolaz' in labels:
+                odds = _feed_odds_values(node)
+                if len(odds) == 2:
+                    winner_odds['Winner1'] = odds[0]
+                    winner_odds['Winner2'] = odds[1]
+                    if verbose:
+                        print(f"✅ Found Winner odds in JSON feed: {winner_odds}")
+                    break
+            queue.extend(node.values())
+        elif isinstance(node, list):
+            queue.extend(node)
+    
+    return winner_odds
+
+def extract_match_info(soup, verbose=False):
+    """Extract match information from the page"""
+    match_info = {}
+    
+    # Try to find team names - single tree walk, stops at the first hit
+    for element in _MATCH_INFO_SELECTOR.iselect(soup):
+        text = element.get_text(strip=True)
+        if ' vs ' in text.lower() or ' - ' in text:
+            match_info['teams'] = text
+            break
+    
     # Try to find date/time
-    time_patterns = [r'\d{1,2}:\d{2}', r'\d{1,2}\.\s*\d{1,2}\.', r'\d{1,2}/\d{1,2}']
-    page_text = soup.get_text()
+    # Check the small date/time nodes first
+    candidate_text = ' '.join(el.get_text(' ', strip=True) for el in _MATCH_TIME_SELECTOR.select(soup, limit=5))
+    for pattern in _TIME_RES:
+        match = pattern.search(candidate_text)
+        if match:
+            match_info['time'] = match.group(0)
+            return match_info
     
-    for pattern in time_patterns:
-        matches = re.findall(pattern, page_text)
-        if matches:
-            match_info['time'] = matches[0]
+    # Otherwise stream the page strings and stop at the first hit (no full page text copy)
+    for pattern in _TIME_RES:
+        match = next((m for m in map(pattern.search, soup.strings) if m), None)
+        if match:
+            match_info['time'] = match.group(0)
             break
     
     return match_info
 
+def _winner_sections(soup):
+    """
+    Yield div/section/table/tbody containers holding "winner" or "prolaz" text, in document order
+    Built from the matching text nodes' ancestors instead of calling get_text() on every container
+    """
+    seen = set()
+    for text_node in soup.find_all(string=_WINNER_SECTION_RE):
+        if text_node.parent.name in ('script', 'style'):
+            continue
+        # Outermost container first, matching document order
+        containers = [parent for parent in text_node.parents if parent.name in _SECTION_TAGS]
+        for container in reversed(containers):
+            if id(container) not in seen:
+                seen.add(id(container))
+                yield container
+
 def extract_winner_odds(soup, verbose=False):
     """Extract Winner 1 and Winner 2 odds from the page"""
     winner_odds = {}
     
-    # Look for sections containing "winner" or "prolaz"
-    page_text = soup.get_text().lower()
-    
     if verbose:
         print("🔍 Searching for Winner odds...")
     
     # Strategy 1: Look for sections with "winner" or "prolaz" keywords
-    possible_sections = soup.find_all(lambda tag: tag.name in ['div', 'section', 'table', 'tbody'] and 
-                                     ('winner' in tag.get_text().lower() or 'prolaz' in tag.get_text().lower()))
-    
-    for section in possible_sections:
+    for section in _winner_sections(soup):
         odds_found = extract_odds_from_section(section, verbose=verbose)
         if odds_found:
             winner_odds.update(odds_found)
@@ -277,14 +422,13 @@ def extract_winner_odds(soup, verbose=False):
             print("🔍 Looking for any two-outcome markets...")
         
         # Find all elements with odds-like numbers
-        odds_pattern = r'\b(\d+\.\d{2})\b'
-        all_elements = soup.find_all(lambda tag: tag.string and re.search(odds_pattern, tag.string))
+        all_elements = soup.find_all(lambda tag: tag.string and _ODDS_RE.search(tag.string))
         
-        # Group nearby odds
+        # Group nearby odds - only the first pair is used, so stop once one is found
         potential_pairs = []
         for i, elem in enumerate(all_elements):
             odds_text = elem.get_text(strip=True)
-            odds_match = re.search(odds_pattern, odds_text)
+            odds_match = _ODDS_RE.search(odds_text)
             if odds_match:
                 odds_value = float(odds_match.group(1))
                 if 1.1 <= odds_value <= 10.0:  # Reasonable odds range
@@ -292,12 +436,14 @@ def extract_winner_odds(soup, verbose=False):
                     for j in range(i+1, min(i+5, len(all_elements))):
                         next_elem = all_elements[j]
                         next_odds_text = next_elem.get_text(strip=True)
-                        next_odds_match = re.search(odds_pattern, next_odds_text)
+                        next_odds_match = _ODDS_RE.search(next_odds_text)
                         if next_odds_match:
                             next_odds_value = float(next_odds_match.group(1))
                             if 1.1 <= next_odds_value <= 10.0:
                                 potential_pairs.append((odds_value, next_odds_value))
                                 break
+            if potential_pairs:
+                break
         
         # Take the first reasonable pair
         if potential_pairs:
@@ -313,11 +459,13 @@ def extract_winner_odds(soup, verbose=False):
         
         for button in buttons[:20]:  # Limit search
             text = button.get_text(strip=True)
-            odds_match = re.search(r'\b(\d+\.\d{2})\b', text)
+            odds_match = _ODDS_RE.search(text)
             if odds_match:
                 odds_value = float(odds_match.group(1))
                 if 1.1 <= odds_value <= 10.0:
                     odds_values.append(odds_value)
+                    if len(odds_values) == 2:
+                        break
         
         if len(odds_values) >= 2:
             winner_odds['Winner1'] = odds_values[0]
@@ -331,20 +479,15 @@ def extract_odds_from_section(section, verbose=False):
     """Extract odds from a specific section"""
     odds = {}
     
-    # Find all numbers that look like odds
+    # Scan numbers that look like odds, stopping once Winner 1/2 are found
     text = section.get_text()
-    odds_pattern = r'\b(\d+\.\d{2})\b'
-    found_odds = re.findall(odds_pattern, text)
-    
-    # Convert to floats and filter reasonable odds
     valid_odds = []
-    for odd in found_odds:
-        try:
-            odd_float = float(odd)
-            if 1.1 <= odd_float <= 10.0:  # Reasonable range for winner odds
-                valid_odds.append(odd_float)
-        except ValueError:
-            continue
+    for match in _ODDS_RE.finditer(text):
+        odd_float = float(match.group(1))
+        if 1.1 <= odd_float <= 10.0:  # Reasonable range for winner odds
+            valid_odds.append(odd_float)
+            if len(valid_odds) == 2:
+                break
     
     # Take first two as Winner 1 and Winner 2
     if len(valid_odds) >= 2:
@@ -409,6 +552,37 @@ def calculate_surebet(winner1_odds, winner2_odds, verbose=True):
             print(f"❌ Error calculating surebet: {e}")
         return {'is_surebet': False, 'error': str(e)}
 
+def calculate_surebet_batch(winner1_odds, winner2_odds, total_stake=10000.0):
+    """
+    Vectorized surebet check for many Winner odds pairs at once
+    
+    Takes two equal-length sequences of odds and returns a dict of NumPy arrays
+    with the same fields calculate_surebet reports for a single pair (stakes,
+    return and profit are computed for every pair; use is_surebet to filter).
+    """
+    import numpy as np
+    
+    odds1 = np.asarray(winner1_odds, dtype=np.float64)
+    odds2 = np.asarray(winner2_odds, dtype=np.float64)
+    
+    prob1 = 1.0 / odds1
+    prob2 = 1.0 / odds2
+    total_prob = prob1 + prob2
+    
+    stake1 = total_stake * prob1 / total_prob
+    stake2 = total_stake * prob2 / total_prob
+    guaranteed_return = np.minimum(stake1 * odds1, stake2 * odds2)
+    
+    return {
+        'is_surebet': total_prob < 1.0,
+        'total_probability': total_prob,
+        'profit_margin': (1.0 - total_prob) * 100,
+        'stake1': stake1,
+        'stake2': stake2,
+        'guaranteed_return': guaranteed_return,
+        'profit': guaranteed_return - total_stake
+    }
+
 if __name__ == "__main__":
     # Configuration
     MATCH_URL = "https://toptiket.rs/odds/football/match/441570"  # Necaxa vs Puebla
@@ -420,7 +594,7 @@ if __name__ == "__main__":
     print("-" * 60)
     
     # Extract winner odds
-    result = login_and_extract_winner(MATCH_URL, USERNAME, PASSWORD, headless=False, verbose=True)
+    result = login_and_extract_winner(MATCH_URL, USERNAME, PASSWORD, headless=False, verbose=True, debug_dump=True)
     
     if result and result['winner_odds']:
         print("\n" + "="*60)
@@ -447,5 +621,5 @@ if __name__ == "__main__":
         print("❌ Failed to extract winner odds")
     
     print("\n💾 Check the following files for detailed results:")
-    print("   - winner_match_page.html (full page HTML)")
-    print("   - winner_results.json (parsed results)")
\ No newline at end of file
+    match_id = MATCH_URL.rstrip('/').rsplit('/', 1)[-1]
+    print(f"   - winner_debug_{match_id}.zip (full page HTML + parsed results)")
\ No newline at end of file
@@ -3,23 +3,283 @@ Enhanced Winner Market Scraper for TopTiket - Fixed for Draw No Bet
 Specifically targets the correct Winner/Draw No Bet section to get 1.32/3.30 odds
 """
 
+import os
 import time
 import json
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
+import multiprocessing
+from collections import deque
+from urllib.parse import urlparse
+
+# Silence webdriver_manager's version-probe logging
+os.environ.setdefault('WDM_LOG_LEVEL', '0')
+
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
+import soupsieve
+import requests
+from toptiket_driver import start_chrome, wait_until, wait_for_odds_refresh
+
+# Known bookmakers; their Winner 1 / Winner 2 odds follow the name within a short window
+BOOKMAKERS = ('Max Bet', 'MerkurXtip', 'Mozzart Bet', 'Oktagon Bet', 'Soccer Bet', 'Admiral')
+BOOKMAKER_NAME_RE = re.compile('|'.join(map(re.escape, BOOKMAKERS)))
+ODDS_PAIR_RE = re.compile(r'(\d+\.\d{2}).{0,80}?(\d+\.\d{2})', re.DOTALL)
+ODDS_WINDOW = 400
+
+# Team-name candidates and the "A vs B" / "A - B" check used on them
+MATCH_SELECTORS = (
+    'h1', 'h2', '.match-title', '.teams', '.fixture-title',
+    '[class*="team"]', '[class*="match"]', '[class*="fixture"]'
+)
+MATCH_SELECTOR = soupsieve.compile(', '.join(MATCH_SELECTORS))
+VS_RE = re.compile(r'\s(?:vs|-)\s', re.IGNORECASE)
+
+# JSON endpoint behind the match page's odds (called with the logged-in session cookies)
+# Not yet checked against the live site, so login_and_extract_winner_http only calls it with use_odds_api=True
+MATCH_ODDS_API = 'https://toptiket.rs/api/odds/match/{match_id}'
+# Market labels that mark a Winner/DNB market object in the JSON
+WINNER_MARKET_RE = re.compile(r'winner|prolaz|draw no bet|dnb', re.IGNORECASE)
+
+# Optional: pyahocorasick finds every bookmaker name in one linear automaton pass
+try:
+    import ahocorasick
+    _BOOKMAKER_AUTOMATON = ahocorasick.Automaton()
+    for _name in BOOKMAKERS:
+        _BOOKMAKER_AUTOMATON.add_word(_name, _name)
+    _BOOKMAKER_AUTOMATON.make_automaton()
+except ImportError:
+    _BOOKMAKER_AUTOMATON = None
+
+# Generated class names of the odds cells; one compiled selector matches both
+ODDS_CLASSES = ('css-12xe39y', 'css-ztpu1k')
+ODDS_SPAN_SELECTOR = ', '.join(f'span.{cls}' for cls in ODDS_CLASSES)
+_ODDS_SPAN_MATCHER = soupsieve.compile(ODDS_SPAN_SELECTOR)
+ODDS_RE = re.compile(r'^\d+\.\d{2}$')
+ALL_ODDS_RE = re.compile(r'\b(\d+\.\d{2})\b')
+
+# Prolaz/Winner tab locators, unioned so the browser walks the DOM once per tier.
+# Explicit "Prolaz" labels are tried first; abbreviations and looser matches only if none is clickable.
+TAB_XPATH = " | ".join([
+    "//a[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
+    "//button[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
+    "//div[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz') and (@role='tab' or contains(@class, 'tab'))]",
+    "//span[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
+    "//a[contains(translate(normalize-space(.), 'PROLAZ,', 'prolaz,'), 'prolaz')]",
+    "//button[contains(translate(normalize-space(.), 'PROLAZ,', 'prolaz,'), 'prolaz')]",
+    "//div[@role='tab' and contains(translate(normalize-space(.), 'PROLAZ,', 'prolaz,'), 'prolaz')]"
+])
+TAB_FALLBACK_XPATH = " | ".join([
+    # Abbreviated versions (P, Prol, etc.)
+    "//a[normalize-space(.)='P']",
+    "//button[normalize-space(.)='P']",
+    "//div[@role='tab' and normalize-space(.)='P']",
+    "//a[contains(text(), 'Prol')]",
+    "//button[contains(text(), 'Prol')]",
+    # Winner text matches
+    "//a[contains(translate(text(), 'WINNER', 'winner'), 'winner')]",
+    "//button[contains(translate(text(), 'WINNER', 'winner'), 'winner')]",
+    "//div[contains(text(), 'Winner')]",
+    # Tab-classed elements and bare 'P' elements
+    "//a[contains(@class, 'tab') and contains(text(), 'P')]",
+    "//button[contains(@class, 'tab') and contains(text(), 'P')]",
+    "//div[contains(@class, 'tab') and contains(text(), 'P')]",
+    "//*[normalize-space(text())='P' and (name()='a' or name()='button' or name()='div')]"
+])
+TAB_XPATH_TIERS = (TAB_XPATH, TAB_FALLBACK_XPATH)
+
+# domain -> {'match': ...}: the match-info selector that worked last time, tried first on the next run.
+# Tab tiers are not learned: the precise Prolaz tier must always run before the loose fallback tier.
+# Opt-in (pass it as priors_path): the saving is one local soup query, not worth a file read per call by default
+SELECTOR_PRIORS_PATH = 'selector_priors.json'
+
+# Elements the flow waits on instead of fixed sleeps
+_USERNAME_INPUT_CSS = "input[name='username'], input[type='text']"
+
+def _login(driver, username, password, verbose=True):
+    """Fill and submit the TopTiket login form, returns True once submitted"""
+    if verbose:
+        print(f"🔐 Logging in to TopTiket with user: {username}")
+    
+    login_url = 'https://toptiket.rs/login'
+    driver.get(login_url)
+    wait_until(driver, EC.element_to_be_clickable((By.CSS_SELECTOR, _USERNAME_INPUT_CSS)))
+    
+    # Find and fill username field
+    username_selectors = [
+        "input[name='username']",
+        "input[name*='user']", 
+        "input[type='text']"
+    ]
+    
+    username_field = None
+    for selector in username_selectors:
+        try:
+            username_field = driver.find_element(By.CSS_SELECTOR, selector)
+            break
+        except:
+            continue
+    
+    if username_field:
+        username_field.clear()
+        username_field.send_keys(username)
+        if verbose:
+            print("✅ Username entered")
+    else:
+        print("❌ Could not find username field")
+        return False
+    
+    # Find and fill password field  
+    password_selectors = [
+        "input[name='password']",
+        "input[type='password']"
+    ]
+    
+    password_field = None
+    for selector in password_selectors:
+        try:
+            password_field = driver.find_element(By.CSS_SELECTOR, selector)
+            break
+        except:
+            continue
+    
+    if password_field:
+        password_field.clear()
+        password_field.send_keys(password)
+        if verbose:
+            print("✅ Password entered")
+    else:
+        print("❌ Could not find password field")
+        return False
+    
+    # Submit login
+    login_button_selectors = [
+        "button[type='submit']",
+        "input[type='submit']",
+        "//button[contains(translate(text(), 'PRIJAVA', 'prijava'), 'prijava')]",
+        "//button[contains(translate(text(), 'ULOGUJ', 'uloguj'), 'uloguj')]",
+        "//input[contains(@value, 'Prijav')]"
+    ]
+    
+    login_submitted = False
+    for selector in login_button_selectors:
+        try:
+            if selector.startswith('//'):
+                button = driver.find_element(By.XPATH, selector)
+            else:
+                button = driver.find_element(By.CSS_SELECTOR, selector)
+            button.click()
+            login_submitted = True
+            break
+        except:
+            continue
+    
+    if not login_submitted:
+        try:
+            password_field.submit()
+            login_submitted = True
+        except:
+            pass
+    
+    if login_submitted:
+        if verbose:
+            print("✅ Login form submitted")
+        wait_until(driver, EC.url_changes(login_url))
+        return True
+    
+    print("❌ Could not submit login form")
+    return False
+
+def _is_logged_in(driver):
+    """TopTiket sends anonymous users back to the login form"""
+    return '/login' not in driver.current_url and not driver.find_elements(By.CSS_SELECTOR, "input[type='password']")
+
+def _save_cookies(driver, cookies_path):
+    """Persist the logged-in session cookies so later runs can skip the login form"""
+    # Write then rename so parallel workers never read a half-written file
+    tmp_path = f'{cookies_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(driver.get_cookies(), f)
+        os.replace(tmp_path, cookies_path)
+    except OSError:
+        pass
+
+def _restore_session(driver, cookies_path, match_url, verbose=True):
+    """
+    Load saved cookies and open the match page directly
+    Returns True if the session is still logged in and the match odds rendered
+    """
+    if not os.path.exists(cookies_path):
+        return False
+    try:
+        with open(cookies_path, 'r', encoding='utf-8') as f:
+            cookies = json.load(f)
+    except (OSError, ValueError):
+        return False
+    
+    # Cookies can only be set for the domain currently open
+    driver.get('https://toptiket.rs')
+    for cookie in cookies:
+        try:
+            driver.add_cookie(cookie)
+        except Exception:
+            continue
+    
+    driver.get(match_url)
+    odds_rendered = wait_until(driver, EC.presence_of_element_located((By.CSS_SELECTOR, ODDS_SPAN_SELECTOR)))
+    
+    # There is no confirmed logged-in marker, so the restored session only counts once the
+    # odds cells render too; otherwise expired cookies are replaced by a fresh login
+    if odds_rendered and _is_logged_in(driver):
+        if verbose:
+            print("🍪 Reused saved TopTiket session cookies")
+        return True
+    return False
 
-def login_and_extract_winner_fixed(match_url, username, password, headless=False, verbose=True):
+def _load_selector_priors(priors_path):
+    """Read the learned selectors file, {} if it is missing or unreadable"""
+    if not (priors_path and os.path.exists(priors_path)):
+        return {}
+    try:
+        with open(priors_path, 'r', encoding='utf-8') as f:
+            priors = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return priors if isinstance(priors, dict) else {}
+
+def _save_selector_priors(priors_path, domain, domain_priors):
+    """Write back the selectors that worked for this domain"""
+    priors = _load_selector_priors(priors_path)
+    priors[domain] = domain_priors
+    tmp_path = f'{priors_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(priors, f, indent=2)
+        os.replace(tmp_path, priors_path)
+    except OSError:
+        pass
+
+def login_and_extract_winner_fixed(match_url, username, password, headless=False, verbose=True,
+                                   cookies_path='toptiket_cookies.json', debug_dump=False,
+                                   priors_path=None):
     """
     Login to TopTiket and extract correct Winner/DNB odds from specific match page
     Enhanced to target the correct Winner market (Draw No Bet)
+    
+    cookies_path: where the logged-in session cookies are kept between calls/runs
+    (None disables reuse and always logs in)
+    debug_dump: write winner_match_page_fixed.html and winner_results_fixed.json
+    priors_path: JSON file remembering which match-info selector worked per domain
+    (e.g. SELECTOR_PRIORS_PATH; None, the default, disables it)
     """
+    domain = urlparse(match_url).netloc
+    domain_priors = dict(_load_selector_priors(priors_path).get(domain, {}))
+    learned_priors = dict(domain_priors)
+    # Older files may hold a learned tab tier; drop it so the precise tier is never demoted
+    learned_priors.pop('tab', None)
+    
     options = Options()
     if headless:
         options.add_argument('--headless=new')
@@ -27,109 +287,33 @@ def login_and_extract_winner_fixed(match_url, username, password, headless=False
     options.add_argument('--disable-dev-shm-usage')
     options.add_argument('--disable-gpu')
     options.add_argument('--window-size=1920,1080')
+    # Performance: odds are read from DOM text, so skip images/css/fonts
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    options.add_argument('--disable-extensions')
+    options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': 2,
+        'profile.managed_default_content_settings.stylesheets': 2,
+        'profile.managed_default_content_settings.fonts': 2
+    })
+    # driver.get() returns at DOMContentLoaded; explicit waits cover the rest
+    options.page_load_strategy = 'eager'
     
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    driver = start_chrome(options)
     
     try:
-        # Step 1: Login
-        if verbose:
-            print(f"🔐 Logging in to TopTiket with user: {username}")
-        
-        driver.get('https://toptiket.rs/login')
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
-        time.sleep(2)
-        
-        # Find and fill username field
-        username_selectors = [
-            "input[name='username']",
-            "input[name*='user']", 
-            "input[type='text']"
-        ]
-        
-        username_field = None
-        for selector in username_selectors:
-            try:
-                username_field = driver.find_element(By.CSS_SELECTOR, selector)
-                break
-            except:
-                continue
-        
-        if username_field:
-            username_field.clear()
-            username_field.send_keys(username)
-            if verbose:
-                print("✅ Username entered")
-        else:
-            print("❌ Could not find username field")
-            return None
-        
-        # Find and fill password field  
-        password_selectors = [
-            "input[name='password']",
-            "input[type='password']"
-        ]
-        
-        password_field = None
-        for selector in password_selectors:
-            try:
-                password_field = driver.find_element(By.CSS_SELECTOR, selector)
-                break
-            except:
-                continue
-        
-        if password_field:
-            password_field.clear()
-            password_field.send_keys(password)
-            if verbose:
-                print("✅ Password entered")
-        else:
-            print("❌ Could not find password field")
-            return None
-        
-        # Submit login
-        login_button_selectors = [
-            "button[type='submit']",
-            "input[type='submit']",
-            "//button[contains(translate(text(), 'PRIJAVA', 'prijava'), 'prijava')]",
-            "//button[contains(translate(text(), 'ULOGUJ', 'uloguj'), 'uloguj')]",
-            "//input[contains(@value, 'Prijav')]"
-        ]
-        
-        login_submitted = False
-        for selector in login_button_selectors:
-            try:
-                if selector.startswith('//'):
-                    button = driver.find_element(By.XPATH, selector)
-                else:
-                    button = driver.find_element(By.CSS_SELECTOR, selector)
-                button.click()
-                login_submitted = True
-                break
-            except:
-                continue
-        
-        if not login_submitted:
-            try:
-                password_field.submit()
-                login_submitted = True
-            except:
-                pass
-        
-        if login_submitted:
+        # Step 1: Login, reusing saved session cookies while they are still valid
+        if not (cookies_path and _restore_session(driver, cookies_path, match_url, verbose=verbose)):
+            if not _login(driver, username, password, verbose=verbose):
+                return None
+            if cookies_path:
+                _save_cookies(driver, cookies_path)
+            
+            # Step 2: Navigate to the specific match
             if verbose:
-                print("✅ Login form submitted")
-            time.sleep(3)
-        else:
-            print("❌ Could not submit login form")
-            return None
-        
-        # Step 2: Navigate to the specific match
-        if verbose:
-            print(f"🏈 Navigating to match: {match_url}")
-        
-        driver.get(match_url)
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
-        time.sleep(3)
+                print(f"🏈 Navigating to match: {match_url}")
+            
+            driver.get(match_url)
+            wait_until(driver, EC.presence_of_element_located((By.CSS_SELECTOR, ODDS_SPAN_SELECTOR)))
         
         # Step 3: Click on Prolaz/Winner tab (enhanced selectors)
         if verbose:
@@ -137,85 +321,34 @@ def login_and_extract_winner_fixed(match_url, username, password, headless=False
         
         tab_clicked = False
         
-        # Wait a bit more for page to fully load
-        time.sleep(2)
-        
-        # Enhanced tab selectors based on enhanced_football_analyzer.py
-        tab_selectors = [
-            # Direct Prolaz text matches
-            "//a[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
-            "//button[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
-            "//div[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz') and (@role='tab' or contains(@class, 'tab'))]",
-            "//span[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
-            
-            # More flexible XPath patterns for Prolaz
-            "//a[contains(translate(normalize-space(.), 'PROLAZ,', 'prolaz,'), 'prolaz')]",
-            "//button[contains(translate(normalize-space(.), 'PROLAZ,', 'prolaz,'), 'prolaz')]",
-            "//div[@role='tab' and contains(translate(normalize-space(.), 'PROLAZ,', 'prolaz,'), 'prolaz')]",
-            
-            # Abbreviated versions (P, Prol, etc.)
-            "//a[normalize-space(.)='P']",
-            "//button[normalize-space(.)='P']", 
-            "//div[@role='tab' and normalize-space(.)='P']",
-            "//a[contains(text(), 'Prol')]",
-            "//button[contains(text(), 'Prol')]",
-            
-            # Winner text matches
-            "//a[contains(translate(text(), 'WINNER', 'winner'), 'winner')]",
-            "//button[contains(translate(text(), 'WINNER', 'winner'), 'winner')]",
-            "//div[contains(text(), 'Winner')]",
-            
-            # CSS selectors converted to XPath
-            "//a[contains(@class, 'tab') and contains(text(), 'P')]",
-            "//button[contains(@class, 'tab') and contains(text(), 'P')]",
-            "//div[contains(@class, 'tab') and contains(text(), 'P')]"
-        ]
-        
-        for selector in tab_selectors:
-            try:
-                tab = driver.find_element(By.XPATH, selector)
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", tab)
-                time.sleep(0.5)
-                
-                # Try both click methods
+        # One find_elements round-trip per tier instead of one find_element per selector
+        for tier_xpath in TAB_XPATH_TIERS:
+            for tab in driver.find_elements(By.XPATH, tier_xpath):
                 try:
-                    tab.click()
-                except:
-                    driver.execute_script("arguments[0].click();", tab)
-                
-                tab_clicked = True
-                if verbose:
+                    if not tab.is_displayed():
+                        continue
+                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", tab)
+                    wait_until(driver, EC.element_to_be_clickable(tab), timeout=3)
+                    previous_odds = driver.find_elements(By.CSS_SELECTOR, ODDS_SPAN_SELECTOR)[:1]
                     tab_text = tab.text.strip()[:20]
-                    print(f"✅ Tab clicked: '{tab_text}' using selector: {selector}")
-                time.sleep(3)  # Wait longer for content to load
-                break
-            except Exception as e:
-                if verbose and "prolaz" in selector.lower():
-                    print(f"   Tried: {selector} - not found")
-                continue
-        
-        # Additional fallback: try to find any clickable element containing 'P' near odds
-        if not tab_clicked:
-            try:
-                if verbose:
-                    print("🔄 Trying fallback: looking for clickable 'P' elements near odds content")
-                
-                # Look for elements with just 'P' that might be tabs
-                p_elements = driver.find_elements(By.XPATH, "//*[normalize-space(text())='P' and (name()='a' or name()='button' or name()='div')]")
-                for p_elem in p_elements:
+                    
+                    # Try both click methods
                     try:
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", p_elem)
-                        time.sleep(0.3)
-                        p_elem.click()
-                        tab_clicked = True
-                        if verbose:
-                            print("✅ Clicked 'P' element as Prolaz tab")
-                        time.sleep(3)
-                        break
+                        tab.click()
                     except:
-                        continue
-            except:
-                pass
+                        driver.execute_script("arguments[0].click();", tab)
+                    
+                    tab_clicked = True
+                    if verbose:
+                        print(f"✅ Tab clicked: '{tab_text}'")
+                    wait_for_odds_refresh(driver, previous_odds, ODDS_SPAN_SELECTOR)
+                    break
+                except:
+                    continue
+            if tab_clicked:
+                break
+            if verbose and tier_xpath is TAB_XPATH:
+                print("🔄 Trying fallback: abbreviated 'P', Winner and tab-class elements")
         
         if not tab_clicked:
             if verbose:
@@ -232,21 +365,26 @@ def login_and_extract_winner_fixed(match_url, username, password, headless=False
         if verbose:
             print("🎯 Extracting Winner (Draw No Bet) odds")
         
-        # Save page source for debugging
         page_source = driver.page_source
-        with open('winner_match_page_fixed.html', 'w', encoding='utf-8') as f:
-            f.write(page_source)
         
-        if verbose:
-            print("💾 Page source saved to winner_match_page_fixed.html for debugging")
+        # Save page source for debugging
+        if debug_dump:
+            with open('winner_match_page_fixed.html', 'w', encoding='utf-8') as f:
+                f.write(page_source)
+            if verbose:
+                print("💾 Page source saved to winner_match_page_fixed.html for debugging")
         
-        soup = BeautifulSoup(page_source, 'html.parser')
+        soup = BeautifulSoup(page_source, 'lxml')
+        page_text = soup.get_text(' ', strip=True)
         
         # Enhanced odds extraction specifically for Winner/DNB market
-        winner_odds = extract_winner_dnb_odds(soup, verbose=verbose)
+        winner_odds = extract_winner_dnb_odds(soup, page_text, verbose=verbose)
         
         # Extract match info
-        match_info = extract_match_info(soup, verbose=verbose)
+        match_info = extract_match_info(soup, verbose=verbose, priors=learned_priors)
+        
+        if priors_path and learned_priors != domain_priors:
+            _save_selector_priors(priors_path, domain, learned_priors)
         
         result = {
             'match_url': match_url,
@@ -262,11 +400,13 @@ def login_and_extract_winner_fixed(match_url, username, password, headless=False
             result['surebet_analysis'] = surebet_info
         
         # Save results
-        with open('winner_results_fixed.json', 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        if debug_dump:
+            with open('winner_results_fixed.json', 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            if verbose:
+                print("💾 Saved results to winner_results_fixed.json")
         
         if verbose:
-            print("💾 Saved results to winner_results_fixed.json")
             print(f"🏆 Match: {match_info.get('teams', 'Unknown')}")
             print(f"📊 Winner/DNB odds: {winner_odds}")
         
@@ -279,74 +419,297 @@ def login_and_extract_winner_fixed(match_url, username, password, headless=False
     finally:
         driver.quit()
 
-def extract_winner_dnb_odds(soup, verbose=False):
+def _scrape_one(job):
+    """Pool worker: scrape one match in its own Chrome (the driver is quit inside)"""
+    match_url, username, password, headless, cookies_path = job
+    return login_and_extract_winner_fixed(match_url, username, password, headless=headless,
+                                          verbose=False, cookies_path=cookies_path)
+
+def login_and_extract_winner_batch(match_urls, username, password, processes=4, headless=True,
+                                   cookies_path='toptiket_cookies.json'):
     """
-    Extract BEST odds for Winner 1 and Winner 2 (Draw No Bet) from all bookmakers
-    Finds the highest odds across all available bookmakers for optimal betting
+    Scrape many matches in parallel, one Chrome per worker process
+    The first match is scraped up front so only it pays for the login; the
+    other workers start from the saved session cookies
     """
-    winner_odds = {}
-    all_bookmaker_odds = []
+    match_urls = list(match_urls)
+    if not match_urls:
+        return []
     
-    if verbose:
-        print("🔍 Extracting Winner/DNB odds from ALL bookmakers to find BEST odds")
-    
-    page_text = soup.get_text()
+    jobs = [(url, username, password, headless, cookies_path) for url in match_urls]
+    results = [_scrape_one(jobs[0])]
     
-    # Known bookmakers and their patterns
-    bookmaker_patterns = {
-        'Max Bet': r'Max Bet.*?(\d+\.\d{2}).*?(\d+\.\d{2})',
-        'MerkurXtip': r'MerkurXtip.*?(\d+\.\d{2}).*?(\d+\.\d{2})',
-        'Mozzart Bet': r'Mozzart Bet.*?(\d+\.\d{2}).*?(\d+\.\d{2})',
-        'Oktagon Bet': r'Oktagon Bet.*?(\d+\.\d{2}).*?(\d+\.\d{2})',
-        'Soccer Bet': r'Soccer Bet.*?(\d+\.\d{2}).*?(\d+\.\d{2})',
-        'Admiral': r'Admiral.*?(\d+\.\d{2}).*?(\d+\.\d{2})',
-    }
+    if len(jobs) > 1:
+        with multiprocessing.Pool(processes=min(processes, len(jobs) - 1)) as pool:
+            results.extend(pool.map(_scrape_one, jobs[1:]))
     
-    # Extract odds from each bookmaker
-    for bookmaker, pattern in bookmaker_patterns.items():
-        match = re.search(pattern, page_text, re.DOTALL)
+    return results
+
+def _iter_bookmaker_names(page_text):
+    """Yield (bookmaker, end_offset) for every bookmaker name in the text"""
+    if _BOOKMAKER_AUTOMATON is not None:
+        for last_index, bookmaker in _BOOKMAKER_AUTOMATON.iter(page_text):
+            yield bookmaker, last_index + 1
+    else:
+        for match in BOOKMAKER_NAME_RE.finditer(page_text):
+            yield match.group(0), match.end()
+
+def _iter_bookmaker_odds(page_text):
+    """
+    Yield (bookmaker, odds1, odds2) for the first odds pair after each bookmaker's name
+    The odds search is bounded to ODDS_WINDOW characters so it can't run across the page
+    Results come out in BOOKMAKERS order (not page order) so ties keep picking the same bookmaker
+    """
+    found = {}
+    for bookmaker, end in _iter_bookmaker_names(page_text):
+        if bookmaker in found:
+            continue
+        match = ODDS_PAIR_RE.search(page_text, end, end + ODDS_WINDOW)
         if match:
-            odds1, odds2 = match.groups()
-            odds1_float = float(odds1)
-            odds2_float = float(odds2)
-            
-            # Validate that these are realistic Winner/DNB odds
-            if 1.0 <= odds1_float <= 2.0 and 2.5 <= odds2_float <= 6.0:
-                all_bookmaker_odds.append({
-                    'bookmaker': bookmaker,
-                    'winner1': odds1_float,
-                    'winner2': odds2_float
-                })
-                if verbose:
-                    print(f"✅ {bookmaker}: Winner1={odds1_float}, Winner2={odds2_float}")
+            found[bookmaker] = (match.group(1), match.group(2))
+            if len(found) == len(BOOKMAKERS):
+                break
+    
+    for bookmaker in BOOKMAKERS:
+        if bookmaker in found:
+            yield (bookmaker,) + found[bookmaker]
+
+def session_from_cookies(cookies):
+    """requests.Session carrying a logged-in browser session's cookies"""
+    session = requests.Session()
+    session.headers['Accept'] = 'application/json'
+    for cookie in cookies:
+        session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+    return session
+
+def _read_saved_cookies(cookies_path):
+    """Cookies saved by _save_cookies, None if there is no readable file"""
+    if not (cookies_path and os.path.exists(cookies_path)):
+        return None
+    try:
+        with open(cookies_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _load_or_create_cookies(username, password, headless=True, verbose=True, cookies_path='toptiket_cookies.json',
+                            force_login=False):
+    """Saved session cookies, or a one-time Selenium login to produce them (force_login skips the saved file)"""
+    if not force_login:
+        cookies = _read_saved_cookies(cookies_path)
+        if cookies is not None:
+            return cookies
+    
+    options = Options()
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    options.page_load_strategy = 'eager'
+    
+    driver = start_chrome(options)
+    try:
+        if not _login(driver, username, password, verbose=verbose):
+            return []
+        if cookies_path:
+            _save_cookies(driver, cookies_path)
+        return driver.get_cookies()
+    finally:
+        driver.quit()
+
+def _iter_json_bookmaker_odds(data):
+    """Yield (bookmaker, odds1, odds2) from the Winner/DNB market under JSON objects labelled with a known bookmaker name"""
+    found = set()
+    queue = deque([data])
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, dict):
+            bookmaker = next((v for v in node.values() if isinstance(v, str) and v in BOOKMAKERS), None)
+            if bookmaker and bookmaker not in found:
+                odds = _json_winner_market_odds(node)
+                if len(odds) == 2:
+                    found.add(bookmaker)
+                    yield bookmaker, odds[0], odds[1]
+                    continue
+            queue.extend(node.values())
+        elif isinstance(node, list):
+            queue.extend(node)
+
+def _json_winner_market_odds(node):
+    """Odds of the first Winner/DNB-labelled object under a JSON node (the node itself included), [] if none"""
+    queue = deque([node])
+    while queue:
+        item = queue.popleft()
+        if isinstance(item, dict):
+            labels = ' '.join(v for v in item.values() if isinstance(v, str))
+            if WINNER_MARKET_RE.search(labels):
+                return _json_odds_values(item)
+            queue.extend(item.values())
+        elif isinstance(item, list):
+            queue.extend(item)
+    return []
+
+def _json_odds_values(node, limit=2):
+    """First odds-looking values (floats or '1.32'-style strings) under a JSON node, in order"""
+    values = []
+    queue = deque([node])
+    while queue and len(values) < limit:
+        item = queue.popleft()
+        if isinstance(item, dict):
+            queue.extend(item.values())
+        elif isinstance(item, list):
+            queue.extend(item)
+        elif isinstance(item, float):
+            values.append(item)
+        elif isinstance(item, str) and ODDS_RE.match(item):
+            values.append(float(item))
+    return values
+
+def login_and_extract_winner_http(match_urls, username, password, headless=True, verbose=True,
+                                  cookies_path='toptiket_cookies.json', use_odds_api=False, processes=4):
+    """
+    Fetch Winner/DNB odds for many matches over plain HTTP
+    Chrome is only used once to log in (or not at all with saved cookies); each match
+    is then a single JSON request. Matches the API can't answer are scraped afterwards
+    with login_and_extract_winner_batch.
     
-    # If we found bookmaker odds, select the best ones
-    if all_bookmaker_odds:
-        # Find BEST (highest) odds for each outcome
-        best_winner1 = max(all_bookmaker_odds, key=lambda x: x['winner1'])
-        best_winner2 = max(all_bookmaker_odds, key=lambda x: x['winner2'])
+    use_odds_api: MATCH_ODDS_API is unverified, so it is opt-in; without it every
+    match goes straight to login_and_extract_winner_batch
+    """
+    match_urls = list(match_urls)
+    if not use_odds_api:
+        return login_and_extract_winner_batch(match_urls, username, password, processes=processes,
+                                              headless=headless, cookies_path=cookies_path)
+    
+    session = session_from_cookies(_load_or_create_cookies(username, password, headless=headless,
+                                                           verbose=verbose, cookies_path=cookies_path))
+    relogged_in = False
+    api_available = True
+    results = [None] * len(match_urls)
+    # Indexes of the matches left for Selenium
+    fallback = []
+    
+    for index, match_url in enumerate(match_urls):
+        if not api_available:
+            fallback.append(index)
+            continue
         
-        winner_odds['Winner1'] = best_winner1['winner1']
-        winner_odds['Winner2'] = best_winner2['winner2']
-        winner_odds['best_bookmaker_w1'] = best_winner1['bookmaker']
-        winner_odds['best_bookmaker_w2'] = best_winner2['bookmaker']
+        match_id = match_url.rstrip('/').rsplit('/', 1)[-1]
+        api_url = MATCH_ODDS_API.format(match_id=match_id)
+        winner_odds = {}
+        try:
+            response = session.get(api_url, timeout=10)
+            if response.status_code in (401, 403) and not relogged_in:
+                # Saved cookies have expired - log in again once and retry with the fresh session
+                if verbose:
+                    print("🔐 Saved session rejected by the odds API, logging in again")
+                relogged_in = True
+                session = session_from_cookies(_load_or_create_cookies(username, password, headless=headless,
+                                                                       verbose=verbose, cookies_path=cookies_path,
+                                                                       force_login=True))
+                response = session.get(api_url, timeout=10)
+            if response.status_code == 404:
+                # No such endpoint - don't spend a request on each remaining match
+                if verbose:
+                    print("⚠️ Odds API not found, using Selenium for the remaining matches")
+                api_available = False
+            elif response.ok:
+                winner_odds = _best_bookmaker_odds(_iter_json_bookmaker_odds(response.json()), verbose=verbose)
+        except (requests.RequestException, ValueError) as e:
+            if verbose:
+                print(f"⚠️ Odds API request failed for {match_id}: {e}")
+        
+        if not winner_odds:
+            fallback.append(index)
+            continue
         
+        results[index] = {
+            'match_url': match_url,
+            'match_info': {},
+            'winner_odds': winner_odds,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'status': 'success',
+            'surebet_analysis': calculate_surebet(winner_odds['Winner1'], winner_odds['Winner2'])
+        }
+    
+    if fallback:
         if verbose:
-            print(f"🏆 BEST Winner1 odds: {winner_odds['Winner1']} ({best_winner1['bookmaker']})")
-            print(f"🏆 BEST Winner2 odds: {winner_odds['Winner2']} ({best_winner2['bookmaker']})")
+            print(f"🔄 No API odds for {len(fallback)} match(es), falling back to Selenium")
+        # Parallel Chrome workers, started from the (possibly refreshed) saved cookies
+        fallback_results = login_and_extract_winner_batch([match_urls[index] for index in fallback], username,
+                                                          password, processes=processes, headless=headless,
+                                                          cookies_path=cookies_path)
+        for index, result in zip(fallback, fallback_results):
+            results[index] = result
+    
+    return results
+
+def _best_bookmaker_odds(bookmaker_odds, verbose=False):
+    """
+    Pick the BEST (highest) Winner1/Winner2 odds from (bookmaker, odds1, odds2) triples
+    Returns {} when no bookmaker has realistic Winner/DNB odds
+    """
+    winner_odds = {}
+    # Running best (odds, bookmaker) per outcome
+    best_w1 = (0.0, None)
+    best_w2 = (0.0, None)
+    
+    for bookmaker, odds1, odds2 in bookmaker_odds:
+        odds1_float = float(odds1)
+        odds2_float = float(odds2)
+        
+        # Validate that these are realistic Winner/DNB odds
+        if 1.0 <= odds1_float <= 2.0 and 2.5 <= odds2_float <= 6.0:
+            # Keep the BEST (highest) odds for each outcome as we go
+            if odds1_float > best_w1[0]:
+                best_w1 = (odds1_float, bookmaker)
+            if odds2_float > best_w2[0]:
+                best_w2 = (odds2_float, bookmaker)
+            if verbose:
+                print(f"✅ {bookmaker}: Winner1={odds1_float}, Winner2={odds2_float}")
+    
+    # If we found bookmaker odds, report the best ones
+    if best_w1[1] is not None:
+        winner_odds['Winner1'] = best_w1[0]
+        winner_odds['Winner2'] = best_w2[0]
+        winner_odds['best_bookmaker_w1'] = best_w1[1]
+        winner_odds['best_bookmaker_w2'] = best_w2[1]
         
+        if verbose:
+            print(f"🏆 BEST Winner1 odds: {winner_odds['Winner1']} ({best_w1[1]})")
+            print(f"🏆 BEST Winner2 odds: {winner_odds['Winner2']} ({best_w2[1]})")
+    
+    return winner_odds
+
+def extract_winner_dnb_odds(soup, page_text=None, verbose=False):
+    """
+    Extract BEST odds for Winner 1 and Winner 2 (Draw No Bet) from all bookmakers
+    Finds the highest odds across all available bookmakers for optimal betting
+    
+    page_text is soup.get_text(' ', strip=True); pass it in when the caller already has it
+    """
+    if verbose:
+        print("🔍 Extracting Winner/DNB odds from ALL bookmakers to find BEST odds")
+    
+    if page_text is None:
+        page_text = soup.get_text(' ', strip=True)
+    
+    # Extract odds for every known bookmaker in a single pass over the page text
+    winner_odds = _best_bookmaker_odds(_iter_bookmaker_odds(page_text), verbose=verbose)
+    if winner_odds:
         return winner_odds
     
     if verbose:
         print("🔍 No bookmaker patterns found, trying generic extraction...")
     
     # Fallback: Extract all odds from the page and find best candidates
-    odds_spans = soup.find_all('span', class_=re.compile(r'css-12xe39y|css-ztpu1k'))
+    odds_spans = _ODDS_SPAN_MATCHER.select(soup)
     all_odds = []
     
     for span in odds_spans:
         text = span.get_text().strip()
-        if re.match(r'^\d+\.\d{2}$', text):
+        if ODDS_RE.match(text):
             odds_value = float(text)
             # Filter for realistic Winner/DNB odds
             if 1.0 <= odds_value <= 6.0:
@@ -374,53 +737,92 @@ def extract_winner_dnb_odds(soup, verbose=False):
     if verbose:
         print("❌ Could not find suitable Winner/DNB odds")
         print("   Available odds on page:")
-        all_page_odds = re.findall(r'\b(\d+\.\d{2})\b', page_text)
-        unique_odds = sorted(set(float(o) for o in all_page_odds if 1.0 <= float(o) <= 10.0))
+        # Debug listing only - stop after 50 plausible odds instead of scanning the whole page
+        all_page_odds = []
+        for match in ALL_ODDS_RE.finditer(page_text):
+            value = float(match[1])
+            if 1.0 <= value <= 10.0:
+                all_page_odds.append(value)
+                if len(all_page_odds) >= 50:
+                    break
+        unique_odds = sorted(set(all_page_odds))
         print(f"   {unique_odds[:20]}")
     
     return winner_odds
 
-def extract_match_info(soup, verbose=False):
-    """Extract match information from the page"""
+def extract_match_info(soup, verbose=False, priors=None):
+    """
+    Extract match information from the page
+    
+    priors: optional dict of learned selectors; its 'match' entry is tried first
+    and updated with the selector that found the teams
+    """
     match_info = {}
     
-    # Try to find team names
-    possible_selectors = [
-        'h1', 'h2', '.match-title', '.teams', '.fixture-title',
-        '[class*="team"]', '[class*="match"]', '[class*="fixture"]'
-    ]
+    if priors and priors.get('match'):
+        for element in soup.select(priors['match']):
+            text = element.get_text(strip=True)
+            if VS_RE.search(text):
+                match_info['teams'] = text
+                return match_info
     
-    for selector in possible_selectors:
-        try:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text(strip=True)
-                if ' vs ' in text.lower() or ' - ' in text:
-                    match_info['teams'] = text
-                    break
-            if 'teams' in match_info:
-                break
-        except:
-            continue
+    # Try to find team names - one compiled selector, stop at the first "A vs B" / "A - B"
+    for element in MATCH_SELECTOR.iselect(soup):
+        text = element.get_text(strip=True)
+        if VS_RE.search(text):
+            match_info['teams'] = text
+            if priors is not None:
+                priors['match'] = next(sel for sel in MATCH_SELECTORS if soupsieve.match(sel, element))
+            break
     
     return match_info
 
 def calculate_surebet(odds1, odds2):
     """Calculate surebet information"""
-    prob1 = 1 / odds1
-    prob2 = 1 / odds2
-    total_prob = prob1 + prob2
+    total_prob = 1.0 / odds1 + 1.0 / odds2
     
+    if total_prob < 1.0:
+        # stake share for each side is (1/odds) / total_prob
+        scale = 100.0 / total_prob
+        profit_margin = (1.0 - total_prob) * 100.0
+        winner1_percent = scale / odds1
+        winner2_percent = scale / odds2
+    else:
+        profit_margin = winner1_percent = winner2_percent = 0
+    
+    return {
+        'is_surebet': total_prob < 1.0,
+        'total_probability': total_prob,
+        'profit_margin_percent': profit_margin,
+        'stake_distribution': {
+            'winner1_percent': winner1_percent,
+            'winner2_percent': winner2_percent
+        }
+    }
+
+def calculate_surebet_batch(odds1_arr, odds2_arr):
+    """
+    Vectorized calculate_surebet for many odds pairs (e.g. across bookmakers)
+    
+    Returns a dict of NumPy arrays with the same fields as calculate_surebet;
+    margin and stake percentages are 0 where the pair is not a surebet.
+    """
+    import numpy as np
+    
+    odds1 = np.asarray(odds1_arr, dtype=np.float64)
+    odds2 = np.asarray(odds2_arr, dtype=np.float64)
+    
+    total_prob = 1.0 / odds1 + 1.0 / odds2
     is_surebet = total_prob < 1.0
-    profit_margin = (1 - total_prob) * 100 if is_surebet else 0
+    scale = np.where(is_surebet, 100.0 / total_prob, 0.0)
     
     return {
         'is_surebet': is_surebet,
         'total_probability': total_prob,
-        'profit_margin_percent': profit_margin,
+        'profit_margin_percent': np.where(is_surebet, (1.0 - total_prob) * 100.0, 0.0),
         'stake_distribution': {
-            'winner1_percent': (prob1 / total_prob) * 100 if is_surebet else 0,
-            'winner2_percent': (prob2 / total_prob) * 100 if is_surebet else 0
+            'winner1_percent': scale / odds1,
+            'winner2_percent': scale / odds2
         }
     }
 
@@ -439,7 +841,8 @@ if __name__ == "__main__":
         username=username,
         password=password,
         headless=False,  # Run headful to see what's happening
-        verbose=True
+        verbose=True,
+        debug_dump=True
     )
     
     if result:
@@ -3,25 +3,188 @@ Enhanced Winner Market Scraper for TopTiket - Fixed for Draw No Bet
 Specifically targets the correct Winner/Draw No Bet section to get 1.32/3.30 odds
 """
 
+import asyncio
 import time
 import json
 import re
-from selenium import webdriver
-from selenium.webdriver.chr                    # Check if these match the expected correct odds (1.32/3.30)
-                    if (abs(valid_odds[0] - 1.32) < 0.05 and abs(valid_odds[1] - 3.30) < 0.05) or \
-                       (abs(valid_odds[1] - 1.32) < 0.05 and abs(valid_odds[0] - 3.30) < 0.05):.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
+from toptiket_driver import start_chrome, locate_all, wait_until, wait_for_odds_refresh
 
-def login_and_extract_winner_fixed(match_url, username, password, headless=False, verbose=True):
+# Optional: orjson writes the results file several times faster than json (falls back to json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+import soupsieve
+
+# Compiled once: odds tokens and every Winner/DNB market label as one alternation
+_ODDS_RE = re.compile(r'\b(\d+\.\d{2})\b')
+_WINNER_RE = re.compile(
+    r'winner|pobednik|pobjed|draw no bet|dnb|bez nerešen|bez neresenog|double chance minus draw',
+    re.IGNORECASE
+)
+
+# Winner/DNB text inside these is a tab/button label or code, never a market column header
+_NON_HEADER_TAGS = ('a', 'button', 'option', 'script', 'style', 'noscript', 'template')
+_NON_HEADER_ROLES = ('tab', 'tablist', 'button', 'option')
+# Cell text of an odds row: odds and '/' or '-' placeholders only; header cells carry letters
+_ODDS_ONLY_RE = re.compile(r'[\d.\s/-]*')
+_LETTER_RE = re.compile(r'[^\W\d_]')
+
+# Strategy 2: odds cells inside odds/market/bet containers, matched in one tree walk
+_ODDS_CELL_SELECTOR = soupsieve.compile(', '.join(
+    f'{container}[class*={word} i] {cell}'
+    for container in ('table', 'div')
+    for word in ('odds', 'market', 'bet')
+    for cell in ('td', 'span')
+))
+
+# Login form locators in priority order, all resolved in one driver call (see locate_all)
+_USERNAME_SELECTORS = ["input[name='username']", "input[name*='user']", "input[type='text']"]
+_PASSWORD_SELECTORS = ["input[name='password']", "input[type='password']"]
+# Submit-type buttons first, labelled Prijava/Uloguj buttons only after them
+_LOGIN_BUTTON_SELECTORS = [
+    "button[type='submit']",
+    "input[type='submit']",
+    "//button[contains(translate(text(), 'PRIJAVA', 'prijava'), 'prijava')]",
+    "//button[contains(translate(text(), 'ULOGUJ', 'uloguj'), 'uloguj')]",
+    "//input[contains(@value, 'Prijav')]"
+]
+
+# Odds cells on the match page (two per bookmaker row) and team-name candidates as one selector
+_ODDS_SPAN_CSS = "span.css-12xe39y, span.css-ztpu1k"
+_MATCH_INFO_SEL = 'h1, h2, .match-title, .teams, .fixture-title, [class*="team"], [class*="match"], [class*="fixture"]'
+_MATCH_INFO_MATCHER = soupsieve.compile(_MATCH_INFO_SEL)
+# Market tab the page marks as showing
+_SELECTED_TAB_MATCHER = soupsieve.compile('[role="tab"][aria-selected="true"]')
+
+# Reads the odds cells (grouped per row: the nearest ancestor holding more than one cell)
+# and team names in one round-trip, without serializing the page
+_DOM_ODDS_JS = """
+const rows = new Map();
+for (const cell of document.querySelectorAll(arguments[0])) {
+    let row = cell.parentElement;
+    while (row && row.querySelectorAll(arguments[0]).length < 2) {
+        row = row.parentElement;
+    }
+    if (!row) continue;
+    if (!rows.has(row)) rows.set(row, []);
+    rows.get(row).push(cell.textContent.trim());
+}
+const odds = Array.from(rows.values());
+for (const e of document.querySelectorAll(arguments[1])) {
+    const text = e.textContent.trim();
+    if (text.toLowerCase().includes(' vs ') || text.includes(' - ')) {
+        return {odds: odds, teams: text};
+    }
+}
+return {odds: odds, teams: null};
+"""
+
+def _winner_pair(odds):
+    """First two plausible Winner/DNB odds (1.1-5.0) as Winner1 <= Winner2, {} if there are none"""
+    valid_odds = [odd for odd in odds if 1.1 <= odd <= 5.0][:2]
+    if len(valid_odds) == 2:
+        return {'Winner1': min(valid_odds), 'Winner2': max(valid_odds)}
+    return {}
+
+def _labelled_winner_row(row):
+    """True if a Winner/DNB label sits in the row's own text or directly in one of its ancestors (not in other rows)"""
+    if _WINNER_RE.search(row.get_text(' ', strip=True)):
+        return True
+    return any(_WINNER_RE.search(text)
+               for ancestor in row.parents
+               for text in ancestor.find_all(string=True, recursive=False))
+
+def _is_header_label(text):
+    """False for Winner/DNB text inside a tab, button, link or script/style - it names no odds column"""
+    return not any(parent.name in _NON_HEADER_TAGS or parent.get('role') in _NON_HEADER_ROLES
+                   for parent in text.parents)
+
+def _cell_odds(cell):
+    """Odds in one cell of an odds row"""
+    return [float(odd) for odd in _ODDS_RE.findall(cell.get_text(' ', strip=True))]
+
+def _odds_cells(node):
+    """A node's child elements if they hold only odds or placeholders (at least one odd), else None"""
+    cells = node.find_all(recursive=False)
+    if (cells and all(_ODDS_ONLY_RE.fullmatch(cell.get_text(' ', strip=True)) for cell in cells)
+            and _ODDS_RE.search(node.get_text(' '))):
+        return cells
+    return None
+
+def _odds_rows(container):
+    """Cells of each odds row in container (itself included) in document order, outermost row only"""
+    stack = [container]
+    while stack:
+        node = stack.pop()
+        cells = _odds_cells(node)
+        if cells is not None:
+            yield cells
+            continue
+        stack.extend(reversed(node.find_all(recursive=False)))
+
+def _winner_header(label, limit=4):
+    """(header_row, column_index, column_count) for the header row in which the label names a column, None if none"""
+    column = label.parent
+    for _ in range(limit):
+        row = column.parent
+        if row is None:
+            return None
+        columns = row.find_all(recursive=False)
+        # Every column of a header is a market name; odds in the row mean it is not a header
+        if (len(columns) > 1 and all(_LETTER_RE.search(col.get_text()) for col in columns)
+                and not _ODDS_RE.search(row.get_text(' '))):
+            index = next(i for i, col in enumerate(columns) if col is column)
+            return row, index, len(columns)
+        column = row
+    return None
+
+def _winner_column_odds(label, limit=2):
     """
-    Login to TopTiket and extract correct Winner/DNB odds from specific match page
-    Enhanced to target the correct Winner market (Draw No Bet)
+    Winner/DNB pair from the odds rows under a label, {} unless the label heads them:
+    either a two-cell odds row right after the label, or a header-row column whose cell
+    holds two odds in the rows that follow the header
     """
+    row = label.parent.find_next_sibling()
+    cells = _odds_cells(row) if row is not None else None
+    if cells is not None and len(cells) == 2 and all(len(_cell_odds(cell)) == 1 for cell in cells):
+        return _winner_pair(odd for cell in cells for odd in _cell_odds(cell))
+    
+    header = _winner_header(label)
+    if header is None:
+        return {}
+    branch, index, count = header
+    # The rows follow the header row, possibly one level up (header and rows in separate wrappers)
+    for _ in range(limit):
+        for sibling in branch.find_next_siblings():
+            for cells in _odds_rows(sibling):
+                if len(cells) != count:
+                    continue
+                odds = _cell_odds(cells[index])
+                winner_odds = _winner_pair(odds) if len(odds) == 2 else {}
+                if winner_odds:
+                    return winner_odds
+        branch = branch.parent
+        if branch is None:
+            break
+    return {}
+
+def _dom_winner_odds(odds_rows):
+    """Winner/DNB odds from the DOM odds cells grouped per row, {} if no two-way row has a plausible pair"""
+    for row in odds_rows:
+        # Placeholder ('/') rows and 3-way rows are not a Winner/DNB pair
+        if len(row) == 2 and all(_ODDS_RE.fullmatch(text) for text in row):
+            winner_odds = _winner_pair(map(float, row))
+            if winner_odds:
+                return winner_odds
+    return {}
+
+def _new_driver(headless=False):
+    """Start a Chrome session for scraping TopTiket"""
     options = Options()
     if headless:
         options.add_argument('--headless=new')
@@ -29,349 +192,467 @@ def login_and_extract_winner_fixed(match_url, username, password, headless=False
     options.add_argument('--disable-dev-shm-usage')
     options.add_argument('--disable-gpu')
     options.add_argument('--window-size=1920,1080')
+    # Performance: odds are read from DOM text, so skip images/css/fonts (JS stays on, odds render client-side)
+    options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': 2,
+        'profile.managed_default_content_settings.fonts': 2,
+        'profile.managed_default_content_settings.stylesheets': 2
+    })
+    # driver.get() returns at DOMContentLoaded; explicit waits cover the rest
+    options.page_load_strategy = 'eager'
     
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    return start_chrome(options)
+
+def _login(driver, username, password, verbose=True):
+    """Fill and submit the TopTiket login form, returns True once submitted"""
+    if verbose:
+        print(f"🔐 Logging in to TopTiket with user: {username}")
     
-    try:
-        # Step 1: Login
+    login_url = 'https://toptiket.rs/login'
+    driver.get(login_url)
+    wait_until(driver, EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='password']")))
+    
+    # Find and fill username field - first hit in selector priority order, not document order
+    # (a header search box can come before the login form's text input)
+    username_field = next(iter(locate_all(driver, _USERNAME_SELECTORS)), None)
+    
+    if username_field:
+        username_field.clear()
+        username_field.send_keys(username)
         if verbose:
-            print(f"🔐 Logging in to TopTiket with user: {username}")
-        
-        driver.get('https://toptiket.rs/login')
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
-        time.sleep(2)
-        
-        # Find and fill username field
-        username_selectors = [
-            "input[name='username']",
-            "input[name*='user']", 
-            "input[type='text']"
-        ]
-        
-        username_field = None
-        for selector in username_selectors:
-            try:
-                username_field = driver.find_element(By.CSS_SELECTOR, selector)
-                break
-            except:
-                continue
-        
-        if username_field:
-            username_field.clear()
-            username_field.send_keys(username)
-            if verbose:
-                print("✅ Username entered")
-        else:
-            print("❌ Could not find username field")
-            return None
-        
-        # Find and fill password field  
-        password_selectors = [
-            "input[name='password']",
-            "input[type='password']"
-        ]
-        
-        password_field = None
-        for selector in password_selectors:
-            try:
-                password_field = driver.find_element(By.CSS_SELECTOR, selector)
-                break
-            except:
-                continue
-        
-        if password_field:
-            password_field.clear()
-            password_field.send_keys(password)
-            if verbose:
-                print("✅ Password entered")
-        else:
-            print("❌ Could not find password field")
-            return None
-        
-        # Submit login
-        login_button_selectors = [
-            "button[type='submit']",
-            "input[type='submit']",
-            "//button[contains(translate(text(), 'PRIJAVA', 'prijava'), 'prijava')]",
-            "//button[contains(translate(text(), 'ULOGUJ', 'uloguj'), 'uloguj')]",
-            "//input[contains(@value, 'Prijav')]"
-        ]
-        
-        login_submitted = False
-        for selector in login_button_selectors:
-            try:
-                if selector.startswith('//'):
-                    button = driver.find_element(By.XPATH, selector)
-                else:
-                    button = driver.find_element(By.CSS_SELECTOR, selector)
-                button.click()
-                login_submitted = True
-                break
-            except:
-                continue
-        
-        if not login_submitted:
-            try:
-                password_field.submit()
-                login_submitted = True
-            except:
-                pass
-        
-        if login_submitted:
-            if verbose:
-                print("✅ Login form submitted")
-            time.sleep(3)
-        else:
-            print("❌ Could not submit login form")
-            return None
-        
-        # Step 2: Navigate to the specific match
+            print("✅ Username entered")
+    else:
+        print("❌ Could not find username field")
+        return False
+    
+    # Find and fill password field  
+    password_field = next(iter(locate_all(driver, _PASSWORD_SELECTORS)), None)
+    
+    if password_field:
+        password_field.clear()
+        password_field.send_keys(password)
         if verbose:
-            print(f"🏈 Navigating to match: {match_url}")
-        
-        driver.get(match_url)
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
-        time.sleep(3)
-        
-        # Step 3: Click on Prolaz/Winner tab
+            print("✅ Password entered")
+    else:
+        print("❌ Could not find password field")
+        return False
+    
+    # Submit login
+    login_buttons = locate_all(driver, _LOGIN_BUTTON_SELECTORS)
+    
+    login_submitted = False
+    if login_buttons:
+        try:
+            login_buttons[0].click()
+            login_submitted = True
+        except:
+            pass
+    
+    if not login_submitted:
+        try:
+            password_field.submit()
+            login_submitted = True
+        except:
+            pass
+    
+    if login_submitted:
         if verbose:
-            print("🎯 Looking for Prolaz/Winner tab")
-        
-        tab_clicked = False
-        tab_selectors = [
-            "//a[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
-            "//button[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
-            "//div[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz') and (@role='tab' or contains(@class, 'tab'))]",
-            "//span[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]"
-        ]
-        
-        for selector in tab_selectors:
-            try:
-                tab = driver.find_element(By.XPATH, selector)
-                driver.execute_script("arguments[0].scrollIntoView(true);", tab)
-                time.sleep(0.5)
-                tab.click()
-                tab_clicked = True
-                if verbose:
-                    print("✅ Prolaz tab clicked")
-                time.sleep(2)
-                break
-            except:
-                continue
-        
-        if not tab_clicked:
+            print("✅ Login form submitted")
+        wait_until(driver, EC.url_changes(login_url))
+        return True
+    
+    print("❌ Could not submit login form")
+    return False
+
+def _scrape_match(driver, match_url, verbose=True, debug_dump=False):
+    """
+    Open a match page in an already logged-in driver and extract its Winner/DNB odds
+    debug_dump: write winner_match_page_fixed.html and winner_results_fixed.json
+    """
+    # Step 2: Navigate to the specific match
+    if verbose:
+        print(f"🏈 Navigating to match: {match_url}")
+    
+    tab_selectors = [
+        "//a[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
+        "//button[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]",
+        "//div[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz') and (@role='tab' or contains(@class, 'tab'))]",
+        "//span[contains(translate(text(), 'PROLAZ', 'prolaz'), 'prolaz')]"
+    ]
+    
+    tab_located = EC.presence_of_element_located((By.XPATH, ' | '.join(tab_selectors)))
+    
+    driver.get(match_url)
+    # The match page is ready once its odds cells or market tabs have rendered
+    wait_until(driver, EC.any_of(tab_located, EC.presence_of_element_located((By.CSS_SELECTOR, _ODDS_SPAN_CSS))))
+    # Short grace period for a tab rendering just after the odds; matches without a Prolaz tab don't wait longer
+    wait_until(driver, tab_located, timeout=2)
+    
+    # Step 3: Click on Prolaz/Winner tab
+    if verbose:
+        print("🎯 Looking for Prolaz/Winner tab")
+    
+    tab_clicked = False
+    
+    for selector in tab_selectors:
+        try:
+            tab = driver.find_element(By.XPATH, selector)
+            driver.execute_script("arguments[0].scrollIntoView(true);", tab)
+            wait_until(driver, EC.element_to_be_clickable(tab), timeout=3)
+            previous_odds = driver.find_elements(By.CSS_SELECTOR, _ODDS_SPAN_CSS)[:1]
+            tab.click()
+            tab_clicked = True
             if verbose:
-                print("⚠️ Could not find/click Prolaz tab, proceeding anyway")
-        
-        # Step 4: Extract Winner/DNB odds with enhanced targeting
+                print("✅ Prolaz tab clicked")
+            wait_for_odds_refresh(driver, previous_odds, _ODDS_SPAN_CSS)
+            break
+        except:
+            continue
+    
+    if not tab_clicked:
         if verbose:
-            print("🎯 Extracting Winner (Draw No Bet) odds")
-        
-        # Save page source for debugging
+            print("⚠️ Could not find/click Prolaz tab, skipping odds (the page shows another market)")
+    
+    # Step 4: Extract Winner/DNB odds with enhanced targeting
+    if verbose:
+        print("🎯 Extracting Winner (Draw No Bet) odds")
+    
+    # Read the odds cells straight from the DOM first - only meaningful once the Prolaz market is showing
+    winner_odds = {}
+    if tab_clicked:
+        dom = driver.execute_script(_DOM_ODDS_JS, _ODDS_SPAN_CSS, _MATCH_INFO_SEL) or {}
+        winner_odds = _dom_winner_odds(dom.get('odds') or [])
+    
+    if winner_odds:
+        match_info = {'teams': dom['teams']} if dom.get('teams') else {}
+        if verbose:
+            print(f"⚡ Found Winner/DNB odds in the odds cells: {winner_odds}")
+    else:
+        # Fall back to parsing the whole page
         page_source = driver.page_source
-        with open('winner_match_page_fixed.html', 'w', encoding='utf-8') as f:
-            f.write(page_source)
         
-        soup = BeautifulSoup(page_source, 'html.parser')
+        # Save page source for debugging
+        if debug_dump:
+            with open('winner_match_page_fixed.html', 'w', encoding='utf-8') as f:
+                f.write(page_source)
         
+        winner_odds, match_info = _parse_page(page_source, verbose=verbose, find_odds=tab_clicked)
+    
+    return _build_result(match_url, winner_odds, match_info, verbose=verbose, debug_dump=debug_dump)
+
+def _winner_tab_selected(soup):
+    """True if the page marks a Prolaz/Winner market tab as the selected one"""
+    return any(_WINNER_RE.search(tab.get_text(' ', strip=True)) for tab in _SELECTED_TAB_MATCHER.iselect(soup))
+
+def _parse_page(page_source, verbose=True, find_odds=True, require_winner_tab=False):
+    """
+    Winner/DNB odds and match info from a match page's HTML (find_odds=False: match info only)
+    require_winner_tab: only take odds if the HTML itself shows the Winner market as selected
+    """
+    soup = BeautifulSoup(page_source, 'lxml')
+    
+    if require_winner_tab and find_odds and not _winner_tab_selected(soup):
+        if verbose:
+            print("⚠️ Winner market is not the selected tab in this HTML, skipping its odds")
+        find_odds = False
+    
+    winner_odds = {}
+    if find_odds:
         # Enhanced odds extraction specifically for Winner/DNB market
         winner_odds = extract_winner_dnb_odds(soup, verbose=verbose)
-        
-        # Extract match info
-        match_info = extract_match_info(soup, verbose=verbose)
-        
-        result = {
-            'match_url': match_url,
-            'match_info': match_info,
-            'winner_odds': winner_odds,
-            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-            'status': 'success' if winner_odds else 'no_odds_found'
-        }
-        
-        # Calculate surebet if we have odds
-        if winner_odds and 'Winner1' in winner_odds and 'Winner2' in winner_odds:
-            surebet_info = calculate_surebet(winner_odds['Winner1'], winner_odds['Winner2'])
-            result['surebet_analysis'] = surebet_info
-        
-        # Save results
-        with open('winner_results_fixed.json', 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
-        
+    
+    # Extract match info
+    match_info = extract_match_info(soup, verbose=verbose)
+    
+    return winner_odds, match_info
+
+def _build_result(match_url, winner_odds, match_info, verbose=True, debug_dump=False):
+    """Assemble the result dict with its surebet analysis (saved to winner_results_fixed.json if debug_dump)"""
+    result = {
+        'match_url': match_url,
+        'match_info': match_info,
+        'winner_odds': winner_odds,
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'status': 'success' if winner_odds else 'no_odds_found'
+    }
+    
+    # Calculate surebet if we have odds
+    if winner_odds and 'Winner1' in winner_odds and 'Winner2' in winner_odds:
+        surebet_info = calculate_surebet(winner_odds['Winner1'], winner_odds['Winner2'])
+        result['surebet_analysis'] = surebet_info
+    
+    # Save results
+    if debug_dump:
+        if orjson is not None:
+            with open('winner_results_fixed.json', 'wb') as f:
+                f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open('winner_results_fixed.json', 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
         if verbose:
             print("💾 Saved results to winner_results_fixed.json")
-            print(f"🏆 Match: {match_info.get('teams', 'Unknown')}")
-            print(f"📊 Winner/DNB odds: {winner_odds}")
+    
+    if verbose:
+        print(f"🏆 Match: {match_info.get('teams', 'Unknown')}")
+        print(f"📊 Winner/DNB odds: {winner_odds}")
+    
+    return result
+
+class WinnerLoginError(Exception):
+    pass
+
+class WinnerScraper:
+    """
+    Logged-in TopTiket Chrome session that can extract many matches
+    
+    Starts Chrome and logs in once; every extract() call only navigates to the match.
+    Use as a context manager (or call close()) to quit Chrome.
+    debug_dump: write winner_match_page_fixed.html and winner_results_fixed.json on each extract()
+    (keep off when several scrapers run at once - they share those file names)
+    """
+    
+    def __init__(self, username, password, headless=False, verbose=True, debug_dump=False):
+        self.verbose = verbose
+        self.debug_dump = debug_dump
+        self.driver = _new_driver(headless)
         
-        return result
+        try:
+            logged_in = _login(self.driver, username, password, verbose=verbose)
+        except Exception as e:
+            print(f"❌ Error during login: {e}")
+            logged_in = False
         
-    except Exception as e:
-        print(f"❌ Error during scraping: {e}")
+        if not logged_in:
+            self.driver.quit()
+            raise WinnerLoginError("Could not log in to TopTiket")
+    
+    def extract(self, match_url):
+        """Extract Winner/DNB odds for one match, None if scraping fails"""
+        try:
+            return _scrape_match(self.driver, match_url, verbose=self.verbose, debug_dump=self.debug_dump)
+        except Exception as e:
+            print(f"❌ Error during scraping: {e}")
+            return None
+    
+    def close(self):
+        self.driver.quit()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def login_and_extract_winner_fixed(match_url, username, password, headless=False, verbose=True, debug_dump=False):
+    """
+    Login to TopTiket and extract correct Winner/DNB odds from specific match page
+    Enhanced to target the correct Winner market (Draw No Bet)
+    One-shot wrapper around WinnerScraper; keep a WinnerScraper open to scrape several matches
+    debug_dump: write winner_match_page_fixed.html and winner_results_fixed.json
+    """
+    try:
+        with WinnerScraper(username, password, headless=headless, verbose=verbose, debug_dump=debug_dump) as scraper:
+            return scraper.extract(match_url)
+    except WinnerLoginError:
         return None
+
+async def login_and_extract_winner_batch(match_urls, username, password, max_concurrency=5, headless=True, verbose=False):
+    """
+    Scrape many matches concurrently with at most max_concurrency Chrome sessions
+    Each session logs in once and is then reused for the next matches
+    Returns the results in match_urls order (None for matches that failed)
+    
+    Usage: results = run_async(login_and_extract_winner_batch(urls, username, password))
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    idle_scrapers = []
+    all_scrapers = []
+    
+    async def scrape(match_url):
+        async with semaphore:
+            if idle_scrapers:
+                scraper = idle_scrapers.pop()
+            else:
+                try:
+                    scraper = await asyncio.to_thread(WinnerScraper, username, password, headless, verbose)
+                except WinnerLoginError:
+                    return None
+                except Exception as e:
+                    # Chrome failed to start - fail this match only, so gather waits for the other sessions
+                    print(f"❌ Error starting Chrome: {e}")
+                    return None
+                all_scrapers.append(scraper)
+            
+            try:
+                return await asyncio.to_thread(scraper.extract, match_url)
+            finally:
+                idle_scrapers.append(scraper)
+    
+    try:
+        return await asyncio.gather(*(scrape(match_url) for match_url in match_urls))
+    finally:
+        for scraper in all_scrapers:
+            scraper.close()
+
+async def login_and_extract_winner_http(match_urls, username, password, headless=True, verbose=False, max_concurrency=10):
+    """
+    Fast path for server-rendered odds: log in once with Chrome, then fetch the
+    match pages over plain HTTP (aiohttp) with the session cookies
+    Matches whose odds are not in the HTTP response fall back to the Chrome session
+    (no tab is clicked over HTTP, so odds are only taken when the HTML shows the Winner market selected)
+    Returns the results in match_urls order (None for matches that failed)
+    
+    Usage: results = run_async(login_and_extract_winner_http(urls, username, password))
+    """
+    import aiohttp
+    from yarl import URL
+    
+    try:
+        scraper = await asyncio.to_thread(WinnerScraper, username, password, headless, verbose)
+    except WinnerLoginError:
+        return [None] * len(match_urls)
+    except Exception as e:
+        print(f"❌ Error starting Chrome: {e}")
+        return [None] * len(match_urls)
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    # One Chrome session, so fallbacks take turns
+    driver_lock = asyncio.Lock()
+    timeout = aiohttp.ClientTimeout(total=5)
+    
+    async def scrape(session, match_url):
+        page_source = ''
+        async with semaphore:
+            try:
+                async with session.get(match_url, timeout=timeout) as response:
+                    if response.status == 200:
+                        page_source = await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
         
+        if page_source:
+            winner_odds, match_info = await asyncio.to_thread(_parse_page, page_source, verbose,
+                                                              require_winner_tab=True)
+            if winner_odds:
+                return _build_result(match_url, winner_odds, match_info, verbose=verbose)
+        
+        if verbose:
+            print(f"🔄 Odds not in HTTP response, using Chrome for {match_url}")
+        async with driver_lock:
+            return await asyncio.to_thread(scraper.extract, match_url)
+    
+    try:
+        cookies = await asyncio.to_thread(scraper.driver.get_cookies)
+        async with aiohttp.ClientSession() as session:
+            session.cookie_jar.update_cookies({c['name']: c['value'] for c in cookies},
+                                              response_url=URL('https://toptiket.rs'))
+            return await asyncio.gather(*(scrape(session, match_url) for match_url in match_urls))
     finally:
-        driver.quit()
+        scraper.close()
+
+def run_async(coro):
+    """Run one of the async batch scrapers, on uvloop when it is installed"""
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    return asyncio.run(coro)
 
 def extract_winner_dnb_odds(soup, verbose=False):
     """
     Enhanced extraction specifically targeting Winner/Draw No Bet market
-    Looking for the correct odds (should be 1.32/3.30, not 1.78/3.95)
+    Returns the first plausible pair from an odds row under a Winner/DNB header
+    (lower odds = Winner1/favorite, higher = Winner2/underdog)
+    Only call it once the Winner/DNB market is showing - it cannot tell which market tab is active
     """
-    winner_odds = {}
-    
     if verbose:
-        print("🔍 Strategy 1: Looking for explicit Winner/DNB sections")
+        print("🔍 Strategy 1: Looking for odds under a Winner/DNB column header")
     
-    # Strategy 1: Look for sections explicitly mentioning Winner or Draw No Bet
-    winner_sections = []
+    # Strategy 1: odds rows headed by a Winner/DNB label
+    # Tab/button labels ("Prolaz, Winner") and script text are skipped - they sit next to whatever market is showing
+    header_keywords = []
     
-    # Find sections with Winner or DNB keywords
-    winner_keywords = [
-        'winner', 'pobednik', 'pobjed', 'draw no bet', 'dnb',
-        'bez nerešen', 'bez neresenog', 'double chance minus draw'
-    ]
-    
-    for keyword in winner_keywords:
-        # Find elements containing the keyword
-        elements = soup.find_all(text=re.compile(keyword, re.IGNORECASE))
-        for element in elements:
-            # Get the parent container
-            parent = element.parent
-            while parent and parent.name != 'body':
-                # Look for odds in this section
-                section_text = parent.get_text()
-                odds_matches = re.findall(r'\b(\d+\.\d{2})\b', section_text)
-                if len(odds_matches) >= 2:
-                    winner_sections.append((parent, odds_matches, keyword))
-                    if verbose:
-                        print(f"   Found section with '{keyword}': {odds_matches[:4]}")
-                parent = parent.parent
-    
-    # Process winner sections
-    if winner_sections:
-        for section, odds_list, keyword in winner_sections:
-            valid_odds = []
-            for odd in odds_list:
-                try:
-                    odd_float = float(odd)
-                    # Winner/DNB odds typically range from 1.1 to 5.0
-                    if 1.1 <= odd_float <= 5.0:
-                        valid_odds.append(odd_float)
-                except ValueError:
-                    continue
-            
-            if len(valid_odds) >= 2:
-                # Check if these match the expected correct odds (1.32/3.30)
-                if (abs(valid_odds[0] - 1.32) < 0.05 and abs(valid_odds[1] - 3.30) < 0.05) or \\
-                   (abs(valid_odds[1] - 1.32) < 0.05 and abs(valid_odds[0] - 3.30) < 0.05):
-                    winner_odds['Winner1'] = min(valid_odds[0], valid_odds[1])  # Lower odds = favorite
-                    winner_odds['Winner2'] = max(valid_odds[0], valid_odds[1])  # Higher odds = underdog
-                    if verbose:
-                        print(f"✅ Found correct Winner/DNB odds from '{keyword}' section: {winner_odds}")
-                    return winner_odds
-                else:
-                    if verbose:
-                        print(f"   Found odds in '{keyword}' section but they don't match expected 1.32/3.30: {valid_odds[:2]}")
+    # One walk over the text nodes for all keywords
+    for element in soup.find_all(string=_WINNER_RE):
+        if not _is_header_label(element):
+            continue
+        keyword = _WINNER_RE.search(element).group(0).lower()
+        header_keywords.append(keyword)
+        
+        # The first header with a plausible pair below it decides
+        winner_odds = _winner_column_odds(element)
+        if winner_odds:
+            if verbose:
+                print(f"✅ Found Winner/DNB odds under '{keyword}' header: {winner_odds}")
+            return winner_odds
     
     if verbose:
         print("🔍 Strategy 2: Looking for odds tables with two-column layout")
     
     # Strategy 2: Look for odds tables or structured layouts
-    tables = soup.find_all(['table', 'div'], class_=re.compile(r'(odds|market|bet)', re.IGNORECASE))
-    
-    for table in tables:
-        rows = table.find_all(['tr', 'div'])
-        for row in rows:
-            cells = row.find_all(['td', 'div', 'span'])
-            if len(cells) >= 2:
-                odds_in_row = []
-                for cell in cells:
-                    cell_text = cell.get_text(strip=True)
-                    odds_match = re.search(r'\b(\d+\.\d{2})\b', cell_text)
-                    if odds_match:
-                        try:
-                            odd_value = float(odds_match.group(1))
-                            if 1.1 <= odd_value <= 5.0:
-                                odds_in_row.append(odd_value)
-                        except ValueError:
-                            continue
-                
-                if len(odds_in_row) >= 2:
-                    # Check if these are our target odds
-                    if (abs(odds_in_row[0] - 1.32) < 0.05 and abs(odds_in_row[1] - 3.30) < 0.05) or \
-                       (abs(odds_in_row[1] - 1.32) < 0.05 and abs(odds_in_row[0] - 3.30) < 0.05):
-                        winner_odds['Winner1'] = 1.32  # Force correct values
-                        winner_odds['Winner2'] = 3.30
-                        if verbose:
-                            print(f"✅ Found target Winner/DNB odds in table: {winner_odds}")
-                        return winner_odds
-    
-    if verbose:
-        print("🔍 Strategy 3: Searching entire page for 1.32 and 3.30 odds pattern")
-    
-    # Strategy 3: Direct search for the specific odds we're looking for
-    page_text = soup.get_text()
-    
-    # Look for both 1.32 and 3.30 on the page
-    has_132 = '1.32' in page_text
-    has_330 = '3.30' in page_text
-    
-    if has_132 and has_330:
-        winner_odds['Winner1'] = 1.32
-        winner_odds['Winner2'] = 3.30
-        if verbose:
-            print("✅ Found both 1.32 and 3.30 on page - using as Winner/DNB odds")
-        return winner_odds
+    # Cells come back in document order; each cell's row is read once with a single text sweep
+    # Only rows under a Winner/DNB label count - an unlabelled row may be 1X2 or any other market
+    seen_rows = set()
+    for cell in _ODDS_CELL_SELECTOR.select(soup):
+        row = cell.find_parent(['tr', 'div'])
+        if id(row) in seen_rows:
+            continue
+        seen_rows.add(id(row))
+        if not _labelled_winner_row(row):
+            continue
+        
+        winner_odds = _winner_pair(map(float, _ODDS_RE.findall(row.get_text(' ', strip=True))))
+        if winner_odds:
+            if verbose:
+                print(f"✅ Found Winner/DNB odds in table: {winner_odds}")
+            return winner_odds
     
     if verbose:
-        print("❌ Could not locate correct Winner/DNB odds (1.32/3.30)")
+        print("❌ Could not locate Winner/DNB odds")
+        for keyword in header_keywords:
+            print(f"   No plausible Winner/DNB odds row under the '{keyword}' header")
         print("   Available odds patterns on page:")
-        all_odds = re.findall(r'\b(\d+\.\d{2})\b', page_text)
-        unique_odds = sorted(set(float(o) for o in all_odds if 1.1 <= float(o) <= 10.0))
+        full_text = soup.get_text(' ', strip=True)
+        unique_odds = sorted(set(odd for odd in map(float, _ODDS_RE.findall(full_text)) if 1.1 <= odd <= 10.0))
         print(f"   {unique_odds[:20]}")  # Show first 20 unique odds
     
-    return winner_odds
+    return {}
 
 def extract_match_info(soup, verbose=False):
     """Extract match information from the page"""
     match_info = {}
     
-    # Try to find team names
-    possible_selectors = [
-        'h1', 'h2', '.match-title', '.teams', '.fixture-title',
-        '[class*="team"]', '[class*="match"]', '[class*="fixture"]'
-    ]
-    
-    for selector in possible_selectors:
-        try:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text(strip=True)
-                if ' vs ' in text.lower() or ' - ' in text:
-                    match_info['teams'] = text
-                    break
-            if 'teams' in match_info:
-                break
-        except:
-            continue
+    # Try to find team names - one walk over all candidates, stop at the first "A vs B" / "A - B"
+    for element in _MATCH_INFO_MATCHER.iselect(soup):
+        text = element.get_text(strip=True)
+        if ' vs ' in text.lower() or ' - ' in text:
+            match_info['teams'] = text
+            break
     
     return match_info
 
+def _surebet_fast(o1: float, o2: float) -> tuple[bool, float, float, float, float]:
+    """(is_surebet, total_probability, profit_margin_percent, winner1_percent, winner2_percent) without building a dict"""
+    inv1 = 1.0 / o1
+    inv2 = 1.0 / o2
+    total_prob = inv1 + inv2
+    if total_prob < 1.0:
+        scale = 100.0 / total_prob
+        return True, total_prob, (1.0 - total_prob) * 100.0, inv1 * scale, inv2 * scale
+    return False, total_prob, 0, 0, 0
+
 def calculate_surebet(odds1, odds2):
     """Calculate surebet information"""
-    prob1 = 1 / odds1
-    prob2 = 1 / odds2
-    total_prob = prob1 + prob2
-    
-    is_surebet = total_prob < 1.0
-    profit_margin = (1 - total_prob) * 100 if is_surebet else 0
+    is_surebet, total_prob, profit_margin, winner1_percent, winner2_percent = _surebet_fast(odds1, odds2)
     
     return {
         'is_surebet': is_surebet,
         'total_probability': total_prob,
         'profit_margin_percent': profit_margin,
         'stake_distribution': {
-            'winner1_percent': (prob1 / total_prob) * 100 if is_surebet else 0,
-            'winner2_percent': (prob2 / total_prob) * 100 if is_surebet else 0
+            'winner1_percent': winner1_percent,
+            'winner2_percent': winner2_percent
         }
     }
 
@@ -390,7 +671,8 @@ if __name__ == "__main__":
         username=username,
         password=password,
         headless=False,  # Run headful to see what's happening
-        verbose=True
+        verbose=True,
+        debug_dump=True
     )
     
     if result: